@@ -4,7 +4,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.db.session import Base   # change path if your DB file is named differently
-from app import models  
+from app.models import order, product, token, user  # noqa: F401  (registers the tables on Base.metadata)
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
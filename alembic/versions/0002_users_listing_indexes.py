@@ -0,0 +1,33 @@
+"""users listing indexes
+
+Composite (filter, id) indexes so GET /users keyset pages filtered by role
+or is_active are index range scans instead of OFFSET scans.
+
+Revision ID: 0002_users_listing_indexes
+Revises: 0001_users_baseline
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_users_listing_indexes'
+down_revision: Union[str, Sequence[str], None] = '0001_users_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_role_id', 'users', ['role', 'id'], unique=False)
+    op.create_index('ix_users_is_active_id', 'users', ['is_active', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_is_active_id', table_name='users')
+    op.drop_index('ix_users_role_id', table_name='users')
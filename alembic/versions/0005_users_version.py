@@ -0,0 +1,32 @@
+"""users row version
+
+Integer bumped on every ORM update of a user; profile reads use it as their
+ETag.
+
+Revision ID: 0005_users_version
+Revises: 0004_cart_orders_inventory
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_users_version'
+down_revision: Union[str, Sequence[str], None] = '0004_cart_orders_inventory'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant server default: no table rewrite on PostgreSQL 11+
+    op.add_column('users', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'version')
@@ -0,0 +1,40 @@
+"""users email credentials index
+
+Replaces the plain unique index on users.email with a unique covering index
+carrying password, role and is_active, so the login lookup is answered from
+the index alone. Index-only scans rely on the visibility map; autovacuum
+keeps it current on a table with this read/write mix.
+
+Revision ID: 0006_users_email_credentials
+Revises: 0005_users_version
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_users_email_credentials'
+down_revision: Union[str, Sequence[str], None] = '0005_users_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # New index first so email uniqueness is enforced throughout
+    op.create_index(
+        'ix_users_email_credentials', 'users', ['email'],
+        unique=True,
+        postgresql_include=['password', 'role', 'is_active']
+    )
+    op.drop_index('ix_users_email', table_name='users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.drop_index('ix_users_email_credentials', table_name='users')
@@ -0,0 +1,46 @@
+"""users token version
+
+Adds users.token_version, carried in tokens as the `tv` claim so role and
+is_active changes invalidate older tokens, and widens the login covering
+index with id and token_version so claims are minted from the index alone.
+
+Revision ID: 0008_users_token_version
+Revises: 0007_revoked_tokens
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_users_token_version'
+down_revision: Union[str, Sequence[str], None] = '0007_revoked_tokens'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant server default: no table rewrite on PostgreSQL 11+
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    # New index first so email uniqueness is enforced throughout
+    op.create_index(
+        'ix_users_email_login', 'users', ['email'],
+        unique=True,
+        postgresql_include=['id', 'password', 'role', 'is_active', 'token_version']
+    )
+    op.drop_index('ix_users_email_credentials', table_name='users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_users_email_credentials', 'users', ['email'],
+        unique=True,
+        postgresql_include=['password', 'role', 'is_active']
+    )
+    op.drop_index('ix_users_email_login', table_name='users')
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,40 @@
+"""products outlive their seller
+
+products.seller_id becomes nullable and ON DELETE SET NULL. With CASCADE,
+deleting a seller tried to delete products that order_items reference
+(ON DELETE RESTRICT) and the whole account deletion failed.
+
+Revision ID: 0009_products_seller_set_null
+Revises: 0008_users_token_version
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_products_seller_set_null'
+down_revision: Union[str, Sequence[str], None] = '0008_users_token_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# PostgreSQL's name for the unnamed constraint created in 0003_catalog
+FK_NAME = 'products_seller_id_fkey'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint(FK_NAME, 'products', type_='foreignkey')
+    op.alter_column('products', 'seller_id', existing_type=sa.Integer(), nullable=True)
+    op.create_foreign_key(FK_NAME, 'products', 'users', ['seller_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails while products of deleted sellers exist; reassign them first
+    op.drop_constraint(FK_NAME, 'products', type_='foreignkey')
+    op.alter_column('products', 'seller_id', existing_type=sa.Integer(), nullable=False)
+    op.create_foreign_key(FK_NAME, 'products', 'users', ['seller_id'], ['id'], ondelete='CASCADE')
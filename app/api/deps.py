@@ -1,17 +1,17 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from app.db.session import get_db
-from app.models.user import User
+from app.db.session import REPLICA_DATABASE_URLS, get_db, get_read_db, session_scope
+from app.models.user import User, UserRole
+from app.services.auth_service import Identity, get_identity_by_email, get_user_by_email
+from app.services.token_revocation import token_revocations
+from app.services.user_cache import cache_user, get_cached_identity, get_cached_user
 from app.utils.security import verify_token
 from sqlalchemy.ext.asyncio import AsyncSession
 # from sqlalchemy.orm import Session
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+async def _verified_payload(token: str) -> dict:
     payload = verify_token(token)
 
     # Block refresh tokens
@@ -22,17 +22,80 @@ def get_current_user(
         )
 
     # Assuming 'sub' in JWT contains the user's email
-    email = payload.get("sub")
-    if not email:
+    if not payload.get("sub"):
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    # Get user by email
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    # In-memory filter; the table is only consulted for (likely) revoked tokens
+    if await token_revocations.is_revoked(payload):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return payload
+
+async def _resolve_current_user(
+    token: str, db: AsyncSession, populate_cache: bool = True, use_cache: bool = True
+) -> User:
+    email = (await _verified_payload(token))["sub"]
+
+    # Identity cache first, then the database
+    user = await get_cached_user(db, email) if use_cache else None
+    if user is None:
+        user = await get_user_by_email(db, email)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        if populate_cache:
+            await cache_user(user)
 
     return user
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    return await _resolve_current_user(token, db)
+
+async def get_current_user_for_update(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    get_current_user for endpoints that modify or delete the user
+
+    Always the current row: users.version guards every write, and the
+    identity cache is per worker, so a cached User may carry a version an
+    update on another worker has already bumped.
+    """
+    return await _resolve_current_user(token, db, use_cache=False)
+
+async def get_current_user_readonly(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_read_db)
+) -> User:
+    """get_current_user for read-only endpoints, resolved on a read replica"""
+    # Replica rows may lag a just-committed write, so they never refill the cache
+    return await _resolve_current_user(token, db, populate_cache=not REPLICA_DATABASE_URLS)
+
+async def _lookup_identity(email: str, db: AsyncSession) -> Identity:
+    identity = await get_cached_identity(email)
+    if identity is None:
+        identity = await get_identity_by_email(db, email)
+        if identity is None:
+            raise HTTPException(status_code=404, detail="User not found")
+    return identity
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> Identity:
+    """
+    The caller from the token's signed claims alone: no query, no cache
+
+    Claims can be one access token lifetime old, except that changing a
+    user's role or is_active bumps token_version, which revokes tokens
+    issued for the old version at once.
+    """
+    payload = await _verified_payload(token)
+    if payload.get("uid") is None or payload.get("tv") is None:
+        # Issued before these claims existed; only these need a session
+        async with session_scope() as db:
+            return await _lookup_identity(payload["sub"], db)
+    return Identity(payload["uid"], payload["sub"], UserRole(payload["role"]), True, payload["tv"])
+
 # async def get_current_user(
 #     token: str = Depends(oauth2_scheme),
 #     db: AsyncSession = Depends(get_db)
@@ -65,12 +128,12 @@ def get_current_user(
 #         )
 #     return payload
 
-def role_required(role: str):
-    def checker(user: dict = Depends(get_current_user)):
-        if user.get("role") != role:
+def role_required(*roles: str):
+    def checker(user: Identity = Depends(get_current_principal)):
+        if user.role not in roles:
             raise HTTPException(
                 status_code=403,
-                detail=f"{role} privileges required"
+                detail=f"{' or '.join(roles)} privileges required"
             )
         return user
     return checker
\ No newline at end of file
@@ -0,0 +1,47 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import role_required
+from app.core.compression import compression
+from app.db.session import get_db, pool_stats
+from app.models.user import UserRole
+from app.schemas.user import UserAccessOut, UserAccessUpdate
+from app.services.password_service import password_hasher
+from app.services.user_service import USER_LIST_FIELDS, iter_user_export, parse_user_fields, update_user_access
+
+router = APIRouter(dependencies=[Depends(role_required(UserRole.ADMIN.value))])
+
+
+@router.get("/metrics/db-pool", summary="Connection pool usage and checkout latency")
+async def db_pool_metrics():
+    return pool_stats()
+
+
+@router.get("/metrics/password-hashing", summary="Password hashing pool queue wait vs. hash time")
+async def password_hashing_metrics():
+    return password_hasher.stats()
+
+
+# Bulk download, not latency-sensitive: spend more CPU per byte saved
+@router.get(
+    "/users/export",
+    summary="Stream every user as JSON lines or CSV",
+    dependencies=[Depends(compression(brotli_quality=6, zstd_level=9))],
+)
+async def export_users(
+    format: Literal["jsonl", "csv"] = "jsonl",
+    fields: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(USER_LIST_FIELDS)}")
+):
+    selected = parse_user_fields(fields, default=list(USER_LIST_FIELDS))
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        iter_user_export(selected, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+
+@router.patch("/users/{user_id}/access", response_model=UserAccessOut, summary="Change a user's role or active flag")
+async def change_user_access(user_id: int, data: UserAccessUpdate, db: AsyncSession = Depends(get_db)):
+    return await update_user_access(db, user_id, data)
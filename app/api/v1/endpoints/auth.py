@@ -1,21 +1,26 @@
+import hashlib
 from jose import JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from app.core.rate_limit import rate_limit_by_ip, rate_limit_email
+from app.core.responses import model_response
 from app.schemas.auth import EmailPasswordLogin, AuthResponse, TokenPair
-from app.services.auth_service import authenticate_user
+from app.services.auth_service import authenticate_user, get_identity_by_email, token_claims
+from app.services.token_revocation import token_revocations
 from app.utils.security import create_tokens, verify_token
 from app.db.session import get_db
 
-router = APIRouter()
+# Per-IP token bucket for each route here; login also limits per account
+router = APIRouter(dependencies=[Depends(rate_limit_by_ip())])
 reuseable_oauth = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 @router.post("/login", response_model=AuthResponse, summary="User login with email/password")
 async def login(
     credentials: EmailPasswordLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Authenticate user with email and password
@@ -24,26 +29,24 @@ async def login(
     - **password**: User's password
     """
     try:
-        user = authenticate_user(db, credentials.email, credentials.password)
+        await rate_limit_email(credentials.email)
+        user = await authenticate_user(db, credentials.email, credentials.password)
         # return create_tokens({
         #     "sub": user.email,
         #     "role": user.role.value
         # })
 
-        tokens = create_tokens({
-            "sub": user.email,
-            "role": user.role.value
-        })
+        tokens = create_tokens(token_claims(user))
         
         # Return a SINGLE dictionary that matches AuthResponse
-        return {
+        return model_response(AuthResponse, {
             "access_token": tokens["access_token"],
             "refresh_token": tokens["refresh_token"],
             "token_type": tokens["token_type"],
             "email": user.email,
             "role": user.role.value,
             "expires_at": datetime.utcnow() + timedelta(minutes=15)
-        }
+        })
     
     except HTTPException as e:
         raise e
@@ -55,9 +58,16 @@ async def login(
    
 
 @router.post("/refresh", response_model=TokenPair)
-def refresh_token(
-    refresh_token: str = Depends(reuseable_oauth)
+async def refresh_token(
+    refresh_token: str = Depends(reuseable_oauth),
+    db: AsyncSession = Depends(get_db)
 ):
+    """
+    Exchange a refresh token for a new pair (rotation)
+
+    Every refresh token works once. Presenting one that was already
+    exchanged means it leaked, so its whole login session is revoked.
+    """
     try:
         payload = verify_token(refresh_token)
         if not payload.get("refresh"):
@@ -65,13 +75,43 @@ def refresh_token(
                 status_code=400,
                 detail="Not a refresh token"
             )
-        
-        return create_tokens({
-            "sub": payload["sub"],
-            "role": payload["role"]
-        })
+        # Tokens issued before rotation have no id; their digest stands in
+        payload.setdefault("jti", hashlib.sha256(refresh_token.encode()).hexdigest())
+
+        if await token_revocations.is_revoked(payload) or not await token_revocations.consume(db, payload):
+            if payload.get("fam"):
+                await token_revocations.revoke_family(db, payload["fam"])
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token has been revoked"
+            )
+
+        # New claims come from the database, never from the old token
+        user = await get_identity_by_email(db, payload["sub"])
+        stale = user is not None and payload.get("tv") not in (None, user.token_version)
+        if user is None or not user.is_active or stale:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Please log in again"
+            )
+
+        return create_tokens(token_claims(user), family=payload.get("fam"))
     except JWTError as e:
         raise HTTPException(
             status_code=401,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: str = Depends(reuseable_oauth),
+    db: AsyncSession = Depends(get_db)
+):
+    """Revoke the login session of this access or refresh token"""
+    payload = verify_token(token)
+    if payload.get("fam"):
+        await token_revocations.revoke_family(db, payload["fam"])
+    else:
+        # Tokens from before login sessions existed can only be revoked per account
+        await token_revocations.revoke_subject(db, payload["sub"])
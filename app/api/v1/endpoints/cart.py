@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_current_user
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.order import CartItemUpdate, CartOut
+from app.services.order_service import get_cart, set_cart_item
+
+router = APIRouter()
+
+
+@router.get("/", response_model=CartOut)
+async def read_cart(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await get_cart(db, current_user)
+
+
+@router.put("/items/{product_id}", response_model=CartOut, summary="Set an item's quantity (0 removes it)")
+async def update_cart_item(
+    product_id: int,
+    item: CartItemUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await set_cart_item(db, current_user, product_id, item.quantity)
+
+
+@router.delete("/items/{product_id}", response_model=CartOut)
+async def remove_cart_item(
+    product_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await set_cart_item(db, current_user, product_id, 0)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import role_required
+from app.db.session import get_db, get_read_db
+from app.models.user import UserRole
+from app.schemas.product import CategoryCreate, CategoryOut
+from app.services.catalog_service import create_category, list_categories
+
+router = APIRouter()
+
+
+@router.get("/", response_model=list[CategoryOut])
+async def read_categories(db: AsyncSession = Depends(get_read_db)):
+    return await list_categories(db)
+
+
+@router.post(
+    "/",
+    response_model=CategoryOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(role_required(UserRole.ADMIN.value))]
+)
+async def create_new_category(category: CategoryCreate, db: AsyncSession = Depends(get_db)):
+    return await create_category(db, category)
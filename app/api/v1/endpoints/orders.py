@@ -0,0 +1,51 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_current_user
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.order import OrderOut
+from app.services.order_service import cancel_order, checkout, get_order, list_orders
+
+router = APIRouter()
+
+
+@router.post(
+    "/checkout",
+    response_model=OrderOut,
+    status_code=status.HTTP_201_CREATED,
+    summary="Place an order for the cart, reserving stock"
+)
+async def checkout_cart(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await checkout(db, current_user)
+
+
+@router.get("/", response_model=list[OrderOut])
+async def read_orders(
+    before_id: Optional[int] = Query(None, description="Cursor: id of the last order on the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await list_orders(db, current_user, before_id=before_id, limit=limit)
+
+
+@router.get("/{order_id}", response_model=OrderOut)
+async def read_order(
+    order_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await get_order(db, current_user, order_id)
+
+
+@router.post("/{order_id}/cancel", response_model=OrderOut)
+async def cancel_existing_order(
+    order_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await cancel_order(db, current_user, order_id)
@@ -0,0 +1,83 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import role_required
+from app.db.session import get_db, get_read_db
+from app.models.user import UserRole
+from app.schemas.order import StockUpdate
+from app.services.auth_service import Identity
+from app.schemas.product import ProductCreate, ProductListResponse, ProductOut, ProductUpdate
+from app.services.catalog_service import (
+    create_product, delete_product, ensure_can_edit, get_product, list_products, update_product
+)
+from app.services.order_service import set_stock
+
+router = APIRouter()
+
+MAX_PAGE_SIZE = 200
+
+seller_required = role_required(UserRole.SELLER.value, UserRole.ADMIN.value)
+
+
+@router.get("/", response_model=ProductListResponse, summary="List or search active products")
+async def read_products(
+    category_id: Optional[int] = None,
+    seller_id: Optional[int] = None,
+    q: Optional[str] = Query(None, min_length=2, max_length=100, description="Full-text / name search"),
+    after_id: Optional[int] = Query(None, description="Cursor: next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await list_products(
+        db, category_id=category_id, seller_id=seller_id, q=q, after_id=after_id, limit=limit
+    )
+
+
+@router.get("/{product_id}", response_model=ProductOut)
+async def read_product(product_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await get_product(db, product_id)
+
+
+@router.post("/", response_model=ProductOut, status_code=status.HTTP_201_CREATED)
+async def create_new_product(
+    product: ProductCreate,
+    current_user: Identity = Depends(seller_required),
+    db: AsyncSession = Depends(get_db)
+):
+    return await create_product(db, current_user, product)
+
+
+@router.patch("/{product_id}", response_model=ProductOut)
+async def update_existing_product(
+    product_id: int,
+    changes: ProductUpdate,
+    current_user: Identity = Depends(seller_required),
+    db: AsyncSession = Depends(get_db)
+):
+    product = await get_product(db, product_id)
+    ensure_can_edit(current_user, product)
+    return await update_product(db, product, changes)
+
+
+@router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_existing_product(
+    product_id: int,
+    current_user: Identity = Depends(seller_required),
+    db: AsyncSession = Depends(get_db)
+):
+    product = await get_product(db, product_id)
+    ensure_can_edit(current_user, product)
+    await delete_product(db, product)
+    return None
+
+
+@router.put("/{product_id}/stock", response_model=StockUpdate, summary="Set available stock")
+async def update_product_stock(
+    product_id: int,
+    stock: StockUpdate,
+    current_user: Identity = Depends(seller_required),
+    db: AsyncSession = Depends(get_db)
+):
+    product = await get_product(db, product_id)
+    ensure_can_edit(current_user, product)
+    return {"available": await set_stock(db, product, stock.available)}
@@ -1,43 +1,131 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
-from sqlalchemy.orm import Session
-from app.api.deps import get_current_user
-from app.models.user import User
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, UploadFile, File, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_current_user_for_update, get_current_user_readonly, role_required
+from app.models.user import User, UserRole
 from app.schemas.profile import ProfileResponse
-from app.schemas.user import UserCreate, UserOut
-from app.services.user_service import get_user_by_email, create_user
-from app.db.session import get_db
-from app.utils.cloudinary_utils import ( upload_to_cloudinary, delete_from_cloudinary )
+from app.schemas.user import UserCreate, UserListResponse, UserOut
+from app.services.user_service import (
+    USER_LIST_FIELDS, create_user, get_user_by_email, get_users_by_ids, list_users, parse_user_fields
+)
+from app.services.token_revocation import token_revocations
+from app.services.user_cache import invalidate_user
+from app.services.avatar_service import delete_image_with_retry, upload_avatar
+from app.services.catalog_service import invalidate_listings, unlist_seller_products
+from app.core.config import settings
+from app.core.http_cache import conditional_response, etag_matches, make_etag
+from app.core.responses import model_response
+from app.db.session import get_db, get_read_db
 import logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.post("/", response_model=UserOut)
-def create_new_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = get_user_by_email(db, email=user.email)
+async def create_new_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
+    db_user = await get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return create_user(db=db, user=user)
+    return await create_user(db=db, user=user)
+
+MAX_BATCH_IDS = 500
+MAX_PAGE_SIZE = 500
+
+def _parse_ids(value: str) -> list[int]:
+    try:
+        return list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+
+@router.get(
+    "/",
+    response_model=UserListResponse,
+    dependencies=[Depends(role_required(UserRole.ADMIN.value))],
+    summary="Batch-resolve users by id, or list them with keyset pagination"
+)
+async def list_or_batch_users(
+    ids: Optional[str] = Query(None, description="Comma-separated user ids to resolve in one query"),
+    fields: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(USER_LIST_FIELDS)}"),
+    after_id: Optional[int] = Query(None, description="Cursor: next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    selected = parse_user_fields(fields, default=["id", "username"])
+
+    if ids is not None:
+        user_ids = _parse_ids(ids)
+        if len(user_ids) > MAX_BATCH_IDS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+        return {"items": await get_users_by_ids(db, user_ids, selected), "next_cursor": None}
+
+    items, next_cursor = await list_users(
+        db, selected, after_id=after_id, limit=limit, role=role, is_active=is_active
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.get("/me", response_model=ProfileResponse)
-async def get_profile(current_user: User = Depends(get_current_user)):
-    return current_user
+async def get_profile(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if request.headers.get("if-none-match"):
+        # The identity cache is per worker and may predate a write made on
+        # another one; a 304 is decided on the row's version, not the cache's
+        version = await db.scalar(select(User.version).where(User.id == current_user.id))
+        if version is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        if version != current_user.version:
+            await invalidate_user(current_user.email)
+            current_user = await db.get(User, current_user.id, populate_existing=True)
+    return conditional_response(
+        request, response, ProfileResponse, current_user,
+        etag=make_etag("me", current_user.id, current_user.version),
+        cache_control="private, no-cache",
+        vary="Authorization",
+    )
 
 @router.get("/{user_id}", response_model=UserOut)
-def read_user(user_id: int, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.id == user_id).first()
+async def read_user(
+    user_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
+    cache_control = f"public, max-age={settings.USER_HTTP_MAX_AGE}"
+    if request.headers.get("if-none-match"):
+        # Revalidation only needs the version, not the row
+        version = await db.scalar(select(User.version).where(User.id == user_id))
+        if version is not None and etag_matches(request.headers["if-none-match"], make_etag(user_id, version)):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": make_etag(user_id, version), "Cache-Control": cache_control},
+            )
+    db_user = await db.get(User, user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return db_user
+    return conditional_response(
+        request, response, UserOut, db_user,
+        etag=make_etag(db_user.id, db_user.version),
+        cache_control=cache_control,
+    )
 
 
 
 @router.patch("/me/avatar", response_model=ProfileResponse)
 async def update_avatar(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_for_update),
+    db: AsyncSession = Depends(get_db)
 ):
+    new_url = None
     try:
         # Verify file is an image
         if not file.content_type.startswith('image/'):
@@ -46,26 +134,40 @@ async def update_avatar(
                 detail="Only image files are allowed"
             )
         
-        # Read file content
-        file_content = await file.read()
+        # Size-capped upload off the event loop
+        old_url = current_user.avatar_url
+        new_url = await upload_avatar(file, folder=f"users/{current_user.id}/avatars")
+        current_user.avatar_url = new_url
         
-        # Delete old avatar if exists
-        if current_user.avatar_url:
-            delete_from_cloudinary(current_user.avatar_url)
+        await db.commit()
+        await invalidate_user(current_user.email)
         
-        # Upload new avatar
-        current_user.avatar_url = upload_to_cloudinary(
-            file_content,
-            folder=f"users/{current_user.id}/avatars"
-        )
+        # Old image is removed after the response is sent
+        if old_url:
+            background_tasks.add_task(
+                delete_image_with_retry, old_url, settings.IMAGE_DELETE_RETRIES
+            )
         
-        db.commit()
-        db.refresh(current_user)
+        await db.refresh(current_user)
         return current_user
     except HTTPException:
         raise
+    except StaleDataError:
+        # A concurrent update bumped users.version first
+        await db.rollback()
+        # Before raising, as background tasks would never run
+        if new_url:
+            await run_in_threadpool(delete_image_with_retry, new_url, settings.IMAGE_DELETE_RETRIES)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profile was modified concurrently, please retry"
+        )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
+        # Don't leave the just-uploaded image orphaned. Done before raising:
+        # background tasks never run once the endpoint raises
+        if new_url:
+            await run_in_threadpool(delete_image_with_retry, new_url, settings.IMAGE_DELETE_RETRIES)
         logger.error(f"Avatar update failed: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -76,20 +178,47 @@ async def update_avatar(
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_account(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user_for_update),
+    db: AsyncSession = Depends(get_db)
 ):
     try:
-        # Delete avatar if exists
-        if current_user.avatar_url:
-            delete_from_cloudinary(current_user.avatar_url)
+        avatar_url = current_user.avatar_url
+        email = current_user.email
         
+        # Products outlive their seller (order items reference them): unlisted,
+        # with products.seller_id set to NULL by the delete
+        categories = await unlist_seller_products(db, current_user.id)
+
         # Delete user from database
-        db.delete(current_user)
-        db.commit()
+        await db.delete(current_user)
+        await db.commit()
+        await invalidate_user(email)
+        if categories:
+            await invalidate_listings(*categories)
+        try:
+            # Tokens already issued stop working everywhere, not just at the next DB lookup
+            await token_revocations.revoke_subject(db, email)
+        except Exception as e:
+            # The account is gone either way: routes that load the user reject its
+            # tokens, claims-only ones accept them until they expire
+            await db.rollback()
+            logger.error(f"Revoking tokens of deleted account {email} failed: {str(e)}")
+        
+        # Delete avatar, if any, after the response is sent
+        if avatar_url:
+            background_tasks.add_task(
+                delete_image_with_retry, avatar_url, settings.IMAGE_DELETE_RETRIES
+            )
         return None
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profile was modified concurrently, please retry"
+        )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Account deletion failed: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
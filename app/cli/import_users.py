@@ -0,0 +1,40 @@
+"""
+Bulk-import users from a CSV or JSONL file.
+
+    python -m app.cli.import_users users.csv [--chunk-size 1000] [--workers 8] [--method copy]
+"""
+import argparse
+import json
+import logging
+from app.db.session import engine
+from app.services.bulk_import_service import import_users
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import users from a CSV or JSONL file")
+    parser.add_argument("path", help=".csv (with header) or .jsonl; fields: email, password, username[, first_name]")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="records per transaction")
+    parser.add_argument("--workers", type=int, default=None, help="password hashing processes (default: CPU count)")
+    parser.add_argument("--method", choices=["copy", "insert"], default="copy")
+    parser.add_argument(
+        "--bcrypt-rounds",
+        type=int,
+        default=None,
+        help="cheaper bcrypt cost for the import; upgraded on each user's first login"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    stats = import_users(
+        engine,
+        args.path,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        method=args.method,
+        bcrypt_rounds=args.bcrypt_rounds,
+    )
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
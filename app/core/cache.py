@@ -0,0 +1,149 @@
+# app/core/cache.py
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+class MemoryCacheBackend:
+    """In-process cache backend; also the local stand-in for Redis in tests"""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60.0):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: dict, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class RedisCacheBackend:
+    """
+    Shared cache backend speaking the Redis protocol
+
+    Values are stored as JSON. Any client exposing the async get/set/delete
+    subset of redis.asyncio.Redis can be passed in (e.g. a local fake).
+    Backend errors are logged and treated as misses so the cache never takes
+    a request down.
+    """
+
+    def __init__(self, url: str = "", ttl: float = 60.0, prefix: str = "", client=None):
+        if client is None:
+            import redis.asyncio as redis  # optional dependency
+            client = redis.from_url(url)
+        self._client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[dict]:
+        try:
+            raw = await self._client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Cache get failed: {str(e)}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: dict, ttl: Optional[float] = None) -> None:
+        try:
+            await self._client.set(
+                self.prefix + key,
+                json.dumps(value),
+                ex=max(int(self.ttl if ttl is None else ttl), 1)
+            )
+        except Exception as e:
+            logger.warning(f"Cache set failed: {str(e)}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._client.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Cache delete failed: {str(e)}")
+
+    def stats(self) -> dict:
+        return {"backend": "redis"}
+
+
+class NullCacheBackend:
+    """Disables caching while keeping the same interface"""
+
+    async def get(self, key: str) -> Optional[dict]:
+        return None
+
+    async def set(self, key: str, value: dict, ttl: Optional[float] = None) -> None:
+        pass
+
+    async def delete(self, key: str) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "none"}
+
+
+def build_cache_backend(backend: str, max_size: int, ttl: float, prefix: str = ""):
+    """Create a cache backend from its settings name: memory, redis or none"""
+    if backend == "redis":
+        return RedisCacheBackend(settings.REDIS_URL, ttl=ttl, prefix=prefix)
+    if backend == "none":
+        return NullCacheBackend()
+    return MemoryCacheBackend(max_size=max_size, ttl=ttl)
@@ -0,0 +1,264 @@
+# app/core/compression.py
+import zlib
+from importlib.util import find_spec
+from typing import Callable, Optional
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+# Per-route overrides, set by the `compression()` dependency
+SCOPE_KEY = "app.compression"
+
+# Chunks at least this large are compressed in the threadpool, so one big
+# response doesn't stall every other request on the event loop
+THREADPOOL_MIN_SIZE = 256 * 1024
+
+# Responses that must not (or cannot usefully) carry a compressed body
+UNCOMPRESSED_STATUSES = {204, 206, 304}
+
+
+class GzipEncoder:
+    """zlib in gzip framing; always available"""
+    name = "gzip"
+    level_option = "gzip_level"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    """Brotli (quality 0-11); requires the brotli package"""
+    name = "br"
+    level_option = "brotli_quality"
+
+    def __init__(self, level: int):
+        import brotli  # optional dependency
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    """Zstandard (level 1-22); requires the zstandard package"""
+    name = "zstd"
+    level_option = "zstd_level"
+
+    def __init__(self, level: int):
+        import zstandard  # optional dependency
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+ENCODERS = {"gzip": GzipEncoder, "br": BrotliEncoder, "zstd": ZstdEncoder}
+_REQUIRES = {"br": "brotli", "zstd": "zstandard"}
+
+
+def available_encodings(names) -> list[str]:
+    """The given encodings, in order, minus unknown ones and those whose package is missing"""
+    return [
+        name for name in names
+        if name in ENCODERS and (name not in _REQUIRES or find_spec(_REQUIRES[name]) is not None)
+    ]
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Accept-Encoding as {coding: q}"""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header: str, preferred: list[str]) -> Optional[str]:
+    """Highest-q coding the client accepts; ties go to the server's preference order"""
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for name in preferred:
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compression(
+    enabled: bool = True,
+    minimum_size: Optional[int] = None,
+    gzip_level: Optional[int] = None,
+    brotli_quality: Optional[int] = None,
+    zstd_level: Optional[int] = None,
+) -> Callable:
+    """
+    Dependency overriding the compression settings of the routes it is
+    attached to; unset values keep the middleware defaults
+    """
+    options = {
+        name: value for name, value in {
+            "enabled": enabled,
+            "minimum_size": minimum_size,
+            "gzip_level": gzip_level,
+            "brotli_quality": brotli_quality,
+            "zstd_level": zstd_level,
+        }.items()
+        if value is not None
+    }
+
+    async def dependency(request: Request) -> None:
+        # The middleware reads this from the same scope once the response starts
+        request.scope[SCOPE_KEY] = options
+
+    return dependency
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with the best coding the client accepts
+
+    Only responses with a listed content type and at least `minimum_size`
+    bytes are compressed (a streamed body counts by its Content-Length when
+    it has one, otherwise it is always compressed, chunk by chunk as it is
+    produced). Bodies already carrying a Content-Encoding, partial and empty
+    statuses and `Cache-Control: no-transform` are left alone. Strong ETags
+    become weak on compressed responses, as the bytes differ.
+
+    Args:
+        encodings: Codings to offer, in server preference order
+        minimum_size: Smallest body in bytes worth compressing
+        content_types: Content type prefixes to compress
+        levels: Default level per option name (gzip_level, brotli_quality,
+            zstd_level); routes override them with the `compression()` dependency
+    """
+
+    def __init__(
+        self,
+        app,
+        encodings: tuple[str, ...] = ("br", "zstd", "gzip"),
+        minimum_size: int = 1024,
+        content_types: tuple[str, ...] = ("application/json", "application/x-ndjson", "text/"),
+        levels: Optional[dict] = None,
+    ):
+        self.app = app
+        self.encodings = available_encodings(encodings)
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        self.levels = {"gzip_level": 6, "brotli_quality": 4, "zstd_level": 3, **(levels or {})}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        start_message = None
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, encoder, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Held until the first body chunk shows how large the body is
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                passthrough = True
+                if start_message is not None:
+                    await send(start_message)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is not None:
+                start, start_message = start_message, None
+                encoder = self._encoder_for(scope, start, accept_encoding, body, more_body)
+                if encoder is None:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                data = await self._compress(encoder, body, more_body)
+                headers = MutableHeaders(scope=start)
+                if not more_body:
+                    headers["Content-Length"] = str(len(data))
+                await send(start)
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            data = await self._compress(encoder, body, more_body)
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _encoder_for(self, scope, start: dict, accept_encoding: str, body: bytes, more_body: bool):
+        """Pick an encoder and rewrite the start message's headers for it, or None to send as is"""
+        headers = MutableHeaders(scope=start)
+        content_type = headers.get("content-type", "")
+        if not content_type.startswith(self.content_types):
+            return None
+        # Whether or not this one is compressed, the URL's representation depends on it
+        headers.add_vary_header("Accept-Encoding")
+
+        options = {**self.levels, "minimum_size": self.minimum_size, **scope.get(SCOPE_KEY, {})}
+        if (
+            not options.get("enabled", True)
+            or start["status"] < 200
+            or start["status"] in UNCOMPRESSED_STATUSES
+            or "content-encoding" in headers
+            or "no-transform" in headers.get("cache-control", "")
+        ):
+            return None
+        size = len(body) if not more_body else int(headers.get("content-length", options["minimum_size"]))
+        if size < options["minimum_size"]:
+            return None
+        encoding = choose_encoding(accept_encoding, self.encodings)
+        if encoding is None:
+            return None
+
+        encoder_cls = ENCODERS[encoding]
+        headers["Content-Encoding"] = encoding
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        return encoder_cls(options[encoder_cls.level_option])
+
+    @staticmethod
+    async def _compress(encoder, data: bytes, more_body: bool) -> bytes:
+        def work() -> bytes:
+            compressed = encoder.compress(data)
+            return compressed if more_body else compressed + encoder.flush()
+
+        if len(data) >= THREADPOOL_MIN_SIZE:
+            return await run_in_threadpool(work)
+        return work()
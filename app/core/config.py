@@ -1,3 +1,4 @@
+from pydantic import PositiveInt
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -5,6 +6,7 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     PROJECT_DESCRIPTION: str = "A FastAPI project with SQLAlchemy"
     VERSION: str = "1.0.0"
+    ENVIRONMENT: str = "development"
     
     # Database
     DB_HOST: str
@@ -12,15 +14,137 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
+    # Use asyncpg + AsyncSession; False falls back to the sync psycopg2 driver
+    DB_ASYNC: bool = True
+    # Run metadata.create_all at startup (development only; otherwise the
+    # schema comes from `alembic upgrade head`)
+    DB_CREATE_TABLES_ON_STARTUP: bool = False
+
+    # Connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 = server default; per transaction with DB_PGBOUNCER
+    # Running behind PgBouncer in transaction mode (disables asyncpg statement caches)
+    DB_PGBOUNCER: bool = False
+
+    # Read replicas: comma-separated postgresql:// URLs, balanced by
+    # "round_robin" or "least_connections"
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_STRATEGY: str = "round_robin"
 
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int 
     REFRESH_TOKEN_EXPIRE_DAYS: int
+    # "jose" (python-jose) or "pyjwt"
+    JWT_BACKEND: str = "jose"
+    # Verified-token cache entries; 0 disables the cache
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    # Revocation of rotated refresh tokens, logged-out sessions and deleted
+    # accounts: a bloom filter of revoked_tokens checked on every request,
+    # synced from the table to pick up other instances' revocations and
+    # rebuilt without expired entries
+    TOKEN_REVOCATION_ENABLED: bool = True
+    TOKEN_REVOCATION_CAPACITY: int = 1000000
+    TOKEN_REVOCATION_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0
+    TOKEN_REVOCATION_COMPACT_SECONDS: float = 3600.0
+
+    # Password hashing pool ("thread" or "process"; 0 workers = CPU count)
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Password hashing policy. The first scheme hashes new passwords; the rest
+    # are still verified and get rehashed on the next successful login.
+    PASSWORD_HASH_SCHEMES: str = "bcrypt"
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_TIME_COST: int = 3
+    ARGON2_PARALLELISM: int = 4
+
+    # Shared cache/store (only used by backends set to "redis")
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # get_current_user identity cache: "memory", "redis" or "none"
+    USER_CACHE_BACKEND: str = "memory"
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 10000
+
+    # Product listing page cache: "memory", "redis" or "none"
+    CATALOG_CACHE_BACKEND: str = "memory"
+    CATALOG_CACHE_TTL_SECONDS: int = 60
+    CATALOG_CACHE_MAX_SIZE: int = 5000
+
+    # Logging: records go through a queue to a listener thread that does the I/O
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" or "text"
+    LOG_FILE: str = ""  # rotating file in addition to stderr, e.g. logs/app.log
+    LOG_QUEUE_SIZE: int = 10000  # records beyond this are dropped, not waited on
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0  # fraction of DEBUG records kept
+    REQUEST_ID_HEADER: str = "X-Request-ID"
+
+    # Cache-Control max-age for public user reads (ETag revalidation after it)
+    USER_HTTP_MAX_AGE: int = 30
+
+    # Serialize hot endpoints with pydantic's model_dump_json and render other
+    # JSON with orjson (if installed) instead of jsonable_encoder + json.dumps
+    FAST_JSON: bool = False
+
+    # Response compression: codings in preference order (br needs brotli,
+    # zstd needs zstandard; missing ones are skipped), for bodies of at least
+    # COMPRESSION_MIN_SIZE bytes with a content type starting with one of
+    # COMPRESSION_CONTENT_TYPES. Routes can override with core.compression.compression()
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: str = "br,zstd,gzip"
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: str = "application/json,application/x-ndjson,text/"
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11
+    COMPRESSION_ZSTD_LEVEL: int = 3  # 1-22
+
+    # Request/DB/bcrypt/Cloudinary timings, served at /metrics (Prometheus text)
+    METRICS_ENABLED: bool = True
+    # Log statements slower than this wherever they run; 0 disables
+    SLOW_QUERY_MS: int = 500
+    # Per-request SQL profiling: warn when one statement repeats this often
+    QUERY_PROFILING: bool = False
+    QUERY_REPEAT_THRESHOLD: int = 5
+    # Server-Timing header with per-request SQL count/time (visible to clients)
+    SERVER_TIMING: bool = False
+
+    # Token-bucket limits on /auth: "memory" (per process) or "redis" (shared).
+    # Sizes and rates must be positive; RATE_LIMIT_ENABLED=false turns it off
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_IP_BURST: PositiveInt = 20
+    RATE_LIMIT_IP_PER_MINUTE: PositiveInt = 10
+    RATE_LIMIT_EMAIL_BURST: PositiveInt = 5
+    RATE_LIMIT_EMAIL_PER_MINUTE: PositiveInt = 5
+    # Take the client IP from X-Forwarded-For (only behind a trusted proxy)
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
 
     CLOUDINARY_CLOUD_NAME: str
     CLOUDINARY_API_KEY: int
     CLOUDINARY_API_SECRET: str 
+
+    # Image storage: "cloudinary" or "local" (filesystem stand-in)
+    IMAGE_STORAGE_BACKEND: str = "cloudinary"
+    LOCAL_STORAGE_DIR: str = "media"
+    LOCAL_STORAGE_BASE_URL: str = "http://localhost:8000/media"
+    IMAGE_DELETE_RETRIES: int = 3
+
+    # Avatar uploads
+    AVATAR_MAX_BYTES: int = 5 * 1024 * 1024
+    AVATAR_CHUNK_SIZE: int = 64 * 1024
+    # Resize/re-encode locally before upload (requires Pillow)
+    AVATAR_PREPROCESS: bool = False
+    AVATAR_SIZE: int = 250
+    AVATAR_WEBP_QUALITY: int = 80
+    IMAGE_PROCESS_WORKERS: int = 0  # 0 = CPU count
     
     class Config:
         case_sensitive = True
@@ -0,0 +1,44 @@
+# app/core/http_cache.py
+from typing import Any, Optional
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from app.core.responses import model_response
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag from a row's identity and version (same data, not same bytes)"""
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check with weak comparison, as RFC 9110 requires for GET"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    schema: type[BaseModel],
+    obj: Any,
+    etag: str,
+    cache_control: str,
+    vary: Optional[str] = None,
+):
+    """
+    304 when the client already has `etag`, otherwise `obj` serialized
+    through `schema`, both carrying the caching headers
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if vary:
+        headers["Vary"] = vary
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    # model_response returns its own Response with FAST_JSON on; otherwise
+    # FastAPI serializes `obj` and copies these headers from `response`
+    response.headers.update(headers)
+    return model_response(schema, obj, headers=headers)
@@ -1,55 +1,149 @@
+import atexit
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
-import os
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 from app.core.config import settings
 
-def setup_logging():
-    """Centralized logging configuration"""
-    
-    # Create logs directory if not exists
-    logs_dir = Path("logs")
-    logs_dir.mkdir(exist_ok=True)
-    
-    # Base configuration
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # File handler (rotating logs)
-    file_handler = RotatingFileHandler(
-        filename=logs_dir / "app.log",
-        maxBytes=1024 * 1024 * 5,  # 5 MB
-        backupCount=3,
-        encoding='utf-8'
-    )
-    file_handler.setFormatter(logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    ))
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(
-        '%(name)-12s: %(levelname)-8s %(message)s'
-    ))
-    
-    # Apply handlers to root logger
+# Set per request by RequestIdMiddleware; stamped on every record logged in it
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", "-") != "-":
+            entry["request_id"] = record.request_id
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """Copy the request id onto the record while still in the request's context"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Keep only a fraction of DEBUG records; INFO and above always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without ever blocking the caller
+
+    When the queue is full the record is dropped and counted rather than
+    stalling the event loop behind a slow disk.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now (args may not be thread-safe to
+        # format later) but leave the structure for the formatter
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _output_handlers() -> list[logging.Handler]:
+    formatter = JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers: list[logging.Handler] = [logging.StreamHandler()]
+    if settings.LOG_FILE:
+        log_file = Path(settings.LOG_FILE)
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        handlers.append(RotatingFileHandler(
+            filename=log_file,
+            maxBytes=1024 * 1024 * 5,  # 5 MB
+            backupCount=3,
+            encoding='utf-8'
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging() -> QueueListener:
+    """
+    Centralized logging configuration
+
+    The root logger only gets a QueueHandler; formatting and console/file I/O
+    (including rotation) happen on a QueueListener thread, so logging from a
+    request path costs a queue put.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    if settings.LOG_DEBUG_SAMPLE_RATE < 1:
+        queue_handler.addFilter(DebugSamplingFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+    queue_handler.addFilter(RequestContextFilter())
+
     root_logger = logging.getLogger()
-    root_logger.addHandler(file_handler)
-    
-    # Development-specific logging
-    if settings.ENVIRONMENT == "development":
-        root_logger.addHandler(console_handler)
-        root_logger.setLevel(logging.DEBUG)
-    else:
-        root_logger.setLevel(logging.INFO)
-    
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(settings.LOG_LEVEL.upper())
+
     # Special logger for Cloudinary operations
-    cloudinary_logger = logging.getLogger("cloudinary")
-    cloudinary_logger.setLevel(logging.WARNING)
-    
+    logging.getLogger("cloudinary").setLevel(logging.WARNING)
+
     # SQLAlchemy logging control
     if settings.ENVIRONMENT != "development":
-        logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
\ No newline at end of file
+        logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, *_output_handlers(), respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread (runs at exit)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,239 @@
+# app/core/metrics.py
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """(upper bound, cumulative count) pairs, ending with +Inf"""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self._counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_seconds": round(self._sum, 6),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in self.cumulative()
+            },
+        }
+
+
+class Counter:
+    """Monotonically increasing count"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class MetricFamily:
+    """One named metric and its children, one per distinct label set"""
+
+    def __init__(self, name: str, help: str, kind: str, labelnames: tuple[str, ...], factory):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = labelnames
+        self._factory = factory
+        self._children: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values) -> Any:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    # Shortcuts for metrics without labels
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+            if self.kind == "counter":
+                lines.append(f"{self.name}{_labels(pairs)} {_number(child.value)}")
+                continue
+            for bound, count in child.cumulative():
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                bucket_pairs = pairs + [f'le="{le}"']
+                lines.append(f"{self.name}_bucket{_labels(bucket_pairs)} {count}")
+            lines.append(f"{self.name}_sum{_labels(pairs)} {_number(child.sum)}")
+            lines.append(f"{self.name}_count{_labels(pairs)} {child.count}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs: list[str]) -> str:
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """Process-wide metric families, rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._families: dict[str, MetricFamily] = {}
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        if family.name in self._families:
+            raise ValueError(f"Metric {family.name} already registered")
+        self._families[family.name] = family
+        return family
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> MetricFamily:
+        return self._register(MetricFamily(name, help, "counter", labelnames, Counter))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> MetricFamily:
+        return self._register(MetricFamily(name, help, "histogram", labelnames, lambda: Histogram(buckets)))
+
+    def render(self) -> str:
+        lines = []
+        for family in self._families.values():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+HTTP_REQUEST_DB_QUERIES = registry.histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request", ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+HTTP_REQUEST_DB_DURATION = registry.histogram(
+    "http_request_db_duration_seconds", "Time spent in SQL per HTTP request", ("route",)
+)
+DB_QUERY_DURATION = registry.histogram("db_query_duration_seconds", "Duration of each SQL statement")
+PASSWORD_HASH_DURATION = registry.histogram(
+    "password_hash_duration_seconds", "Password hash/verify time on the worker pool", ("operation",)
+)
+PASSWORD_HASH_QUEUE_WAIT = registry.histogram(
+    "password_hash_queue_wait_seconds", "Time password hashing calls wait for a free worker"
+)
+CLOUDINARY_DURATION = registry.histogram(
+    "cloudinary_request_duration_seconds", "Cloudinary API call latency", ("operation",)
+)
+CLOUDINARY_ERRORS = registry.counter(
+    "cloudinary_errors_total", "Failed Cloudinary API calls", ("operation",)
+)
+
+
+class RequestStats:
+    """Per-request accumulators, reachable from anywhere via current_request_stats"""
+
+    __slots__ = ("request", "queries", "db_seconds", "slow_queries", "statements")
+
+    def __init__(self, request: str = "", profile: bool = False):
+        self.request = request
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slow_queries = 0
+        # SQL text -> [executions, seconds]; only collected while profiling
+        self.statements: Optional[dict[str, list]] = {} if profile else None
+
+    def record_query(self, statement: str, elapsed: float, slow: bool = False) -> None:
+        self.queries += 1
+        self.db_seconds += elapsed
+        if slow:
+            self.slow_queries += 1
+        if self.statements is not None:
+            entry = self.statements.get(statement)
+            if entry is None:
+                self.statements[statement] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int, float]]:
+        """Statements run at least `threshold` times, most frequent first"""
+        if not self.statements or threshold <= 0:
+            return []
+        repeated = [
+            (statement, count, seconds)
+            for statement, (count, seconds) in self.statements.items()
+            if count >= threshold
+        ]
+        return sorted(repeated, key=lambda item: item[1], reverse=True)
+
+
+def compact_sql(statement: str, limit: int = 500) -> str:
+    """SQL on one line, cut to `limit` characters for log messages"""
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+@contextmanager
+def timed(histogram: Histogram):
+    """Observe the duration of the block, whether or not it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start)
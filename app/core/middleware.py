@@ -0,0 +1,181 @@
+# app/core/middleware.py
+import logging
+import time
+import uuid
+from starlette.responses import JSONResponse
+from app.core.logger import request_id_var
+from app.core.metrics import (
+    HTTP_REQUEST_DB_DURATION, HTTP_REQUEST_DB_QUERIES, HTTP_REQUEST_DURATION, HTTP_REQUESTS,
+    RequestStats, compact_sql, current_request_stats
+)
+
+logger = logging.getLogger(__name__)
+
+
+def route_template(scope) -> str:
+    """
+    The matched route as a template, e.g. /api/v1/users/{user_id}
+
+    Rebuilt from the path and its parameters because the route object's own
+    path lacks the router prefix on recent FastAPI versions.
+    """
+    if "endpoint" not in scope:
+        return "unmatched"
+    params = scope.get("path_params")
+    if not params:
+        return scope["path"]
+    names = {str(value): name for name, value in params.items()}
+    return "/".join(
+        f"{{{names[segment]}}}" if segment in names else segment
+        for segment in scope["path"].split("/")
+    )
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and SQL time per route template
+
+    Plain ASGI rather than BaseHTTPMiddleware so it adds no extra task or
+    body buffering per request. Routes are labelled by their template
+    ("/users/{user_id}"), never the raw path, to keep label cardinality bounded.
+
+    Args:
+        record_metrics: Feed the /metrics histograms and counters
+        profile_queries: Keep every SQL statement of the request and warn
+            about statements repeated `repeat_threshold` times (likely N+1)
+        server_timing: Add a Server-Timing header with SQL count and time
+    """
+
+    def __init__(
+        self,
+        app,
+        record_metrics: bool = True,
+        profile_queries: bool = False,
+        repeat_threshold: int = 5,
+        server_timing: bool = False,
+    ):
+        self.app = app
+        self.record_metrics = record_metrics
+        self.profile_queries = profile_queries
+        self.repeat_threshold = repeat_threshold
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats(f"{method} {scope['path']}", profile=self.profile_queries)
+        token = current_request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    # SQL issued while a streaming body is sent isn't included
+                    timing = (
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+                        f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+                    )
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request_stats.reset(token)
+            route = route_template(scope)
+            if self.record_metrics:
+                HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+                HTTP_REQUEST_DURATION.labels(method, route).observe(elapsed)
+                HTTP_REQUEST_DB_QUERIES.labels(route).observe(stats.queries)
+                HTTP_REQUEST_DB_DURATION.labels(route).observe(stats.db_seconds)
+            if self.profile_queries:
+                self._report(method, route, stats, elapsed)
+
+    def _report(self, method: str, route: str, stats: RequestStats, elapsed: float) -> None:
+        """Log the request's SQL summary; warn when it looks like an N+1"""
+        repeated = stats.repeated_statements(self.repeat_threshold)
+        summary = (
+            f"{method} {route}: {stats.queries} queries ({len(stats.statements)} distinct), "
+            f"{stats.db_seconds * 1000:.1f} ms SQL of {elapsed * 1000:.1f} ms, "
+            f"{stats.slow_queries} slow"
+        )
+        if not repeated:
+            logger.debug(summary)
+            return
+        details = "; ".join(
+            f"{count}x ({seconds * 1000:.1f} ms) {compact_sql(statement, 200)}"
+            for statement, count, seconds in repeated[:3]
+        )
+        logger.warning(f"Possible N+1 in {summary}. Repeated: {details}")
+
+
+class RequestIdMiddleware:
+    """
+    Correlates every log record of a request through one id
+
+    Reuses the caller's id header when present (so ids follow a request
+    across services) and echoes it on the response.
+    """
+
+    def __init__(self, app, header: str = "X-Request-ID"):
+        self.app = app
+        self.header = header.lower().encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = next(
+            (value.decode("latin-1")[:128] for name, value in scope["headers"] if name == self.header),
+            None,
+        ) or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (self.header, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
+
+class BodySizeLimitMiddleware:
+    """
+    Rejects requests whose declared Content-Length exceeds a per-path limit
+
+    Runs before the body is read, so an oversized upload is refused with 413
+    instead of being spooled in full by the multipart parser first. Chunked
+    requests declare no length; the endpoint still checks what it received.
+
+    Args:
+        limits: Maximum body size in bytes by exact request path
+    """
+
+    def __init__(self, app, limits: dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is not None:
+            declared = next((value for name, value in scope["headers"] if name == b"content-length"), None)
+            if declared is not None and declared.isdigit() and int(declared) > limit:
+                response = JSONResponse(
+                    {"detail": f"Request body must be at most {limit // 1024} KB"},
+                    status_code=413,
+                    headers={"Connection": "close"},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
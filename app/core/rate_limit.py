@@ -0,0 +1,182 @@
+# app/core/rate_limit.py
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from fastapi import HTTPException, Request, status
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryRateLimitStore:
+    """
+    In-process token-bucket store
+
+    Buckets are spread over independently locked shards so concurrent checks
+    on different keys rarely contend. Each shard is LRU-bounded; an evicted
+    bucket simply starts full again.
+    """
+
+    def __init__(self, shards: int = 16, max_keys: int = 100000):
+        self._shards = [OrderedDict() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._max_per_shard = max(max_keys // shards, 1)
+
+    def take(self, key: str, capacity: int, refill_per_second: float, cost: int = 1) -> float:
+        """
+        Take `cost` tokens from the bucket for `key`
+
+        Returns:
+            0.0 if the request is allowed, otherwise seconds until it would be
+        """
+        index = hash(key) % len(self._shards)
+        buckets = self._shards[index]
+        now = time.monotonic()
+        with self._locks[index]:
+            tokens, updated_at = buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+            if tokens >= cost:
+                buckets[key] = (tokens - cost, now)
+                retry_after = 0.0
+            else:
+                buckets[key] = (tokens, now)
+                retry_after = (cost - tokens) / refill_per_second
+            buckets.move_to_end(key)
+            if len(buckets) > self._max_per_shard:
+                buckets.popitem(last=False)
+        return retry_after
+
+    async def acquire(self, key: str, capacity: int, refill_per_second: float, cost: int = 1) -> float:
+        return self.take(key, capacity, refill_per_second, cost)
+
+    def reset(self) -> None:
+        for lock, buckets in zip(self._locks, self._shards):
+            with lock:
+                buckets.clear()
+
+
+# Refill and take in one round trip; the bucket expires once it would be full
+# again anyway. Uses the server clock so app instances never disagree.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimitStore:
+    """
+    Token buckets shared by every app instance, kept in a Redis-protocol server
+
+    Any client exposing an async `eval` like redis.asyncio.Redis can be passed
+    in. Backend errors are logged and the request is let through: an outage
+    of the limiter must not lock everyone out of login.
+    """
+
+    def __init__(self, url: str = "", prefix: str = "ratelimit:", client=None):
+        if client is None:
+            import redis.asyncio as redis  # optional dependency
+            client = redis.from_url(url)
+        self._client = client
+        self.prefix = prefix
+
+    async def acquire(self, key: str, capacity: int, refill_per_second: float, cost: int = 1) -> float:
+        try:
+            raw = await self._client.eval(
+                TOKEN_BUCKET_SCRIPT, 1, self.prefix + key, capacity, refill_per_second, cost
+            )
+        except Exception as e:
+            logger.warning(f"Rate limit check failed: {str(e)}")
+            return 0.0
+        return float(raw)
+
+
+def build_rate_limit_store(backend: str):
+    """Create a rate limit store from its settings name: memory or redis"""
+    if backend == "redis":
+        return RedisRateLimitStore(settings.REDIS_URL)
+    return MemoryRateLimitStore()
+
+
+rate_limit_store = build_rate_limit_store(settings.RATE_LIMIT_BACKEND)
+
+
+def client_ip(request: Request) -> str:
+    """Caller address; X-Forwarded-For is only trusted behind a known proxy"""
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",", 1)[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def enforce_rate_limit(key: str, capacity: int, per_minute: int, store=None) -> None:
+    """
+    Take one token for `key` or reject the request
+
+    Raises:
+        HTTPException: 429 with a Retry-After header when the bucket is empty
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    retry_after = await (store or rate_limit_store).acquire(key, capacity, per_minute / 60.0)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def rate_limit_by_ip(
+    scope: Optional[str] = None,
+    capacity: Optional[int] = None,
+    per_minute: Optional[int] = None,
+) -> Callable:
+    """
+    Dependency limiting each client IP; the bucket is per route unless a
+    scope is given
+
+    Raises:
+        ValueError: capacity or per_minute given and not positive (a zero
+            refill rate would divide by zero in the bucket)
+    """
+    if capacity is None:
+        capacity = settings.RATE_LIMIT_IP_BURST
+    if per_minute is None:
+        per_minute = settings.RATE_LIMIT_IP_PER_MINUTE
+    if capacity <= 0 or per_minute <= 0:
+        raise ValueError("Rate limit capacity and per_minute must be positive")
+
+    async def dependency(request: Request) -> None:
+        name = scope or request.url.path
+        await enforce_rate_limit(f"ip:{name}:{client_ip(request)}", capacity, per_minute)
+
+    return dependency
+
+
+async def rate_limit_email(email: str) -> None:
+    """Limit attempts against one account regardless of the caller's IP"""
+    await enforce_rate_limit(
+        f"email:{email.strip().lower()}",
+        settings.RATE_LIMIT_EMAIL_BURST,
+        settings.RATE_LIMIT_EMAIL_PER_MINUTE,
+    )
@@ -0,0 +1,48 @@
+# app/core/responses.py
+import json
+from decimal import Decimal
+from typing import Any, Optional
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from app.core.config import settings
+
+try:
+    import orjson  # optional dependency
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when installed
+
+    Falls back to compact stdlib json, so switching it on never requires the
+    extra dependency.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def model_response(schema: type[BaseModel], obj: Any, status_code: int = 200, headers: Optional[dict] = None):
+    """
+    Serialize `obj` through `schema` straight to JSON bytes
+
+    With FAST_JSON on this validates once (from attributes) and dumps in
+    pydantic's Rust core, bypassing FastAPI's response_model handling
+    (re-validation, jsonable_encoder, json.dumps). Keep `response_model=` on
+    the route for the OpenAPI schema. With FAST_JSON off `obj` is returned
+    unchanged and FastAPI serializes it as usual.
+    """
+    if not settings.FAST_JSON:
+        return obj
+    body = schema.model_validate(obj, from_attributes=True).model_dump_json()
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,146 @@
+# app/db/pool.py
+import logging
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import settings
+from app.core.metrics import DB_QUERY_DURATION, Histogram, compact_sql, current_request_stats
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Checkout latency and timeout counts for one connection pool"""
+
+    def __init__(self):
+        self.checkout_latency = Histogram()
+        self.timeouts = 0
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout, including queueing for a free slot and pre-ping"""
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        metrics = self.__dict__.get("_metrics")
+        if metrics is None:
+            metrics = self.__dict__["_metrics"] = PoolMetrics()
+        return metrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.checkout_latency.observe(time.perf_counter() - start)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "timeouts": self.metrics.timeouts,
+            "wait_seconds_total": round(self.metrics.checkout_latency.sum, 6),
+            "checkout_latency": self.metrics.checkout_latency.snapshot(),
+        }
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(is_async: bool = False) -> dict:
+    """create_engine/create_async_engine keyword arguments from Settings"""
+    options = {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if is_async and settings.DB_PGBOUNCER:
+        # PgBouncer transaction pooling can't keep server-side prepared statements
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+        }
+    return options
+
+
+def install_statement_timeout(sync_engine) -> None:
+    """
+    Apply DB_STATEMENT_TIMEOUT_MS to every connection or, with DB_PGBOUNCER,
+    to every transaction
+
+    A startup `options` parameter is rejected by PgBouncer. A session-level
+    SET on connect would stick to whichever server connection PgBouncer
+    (transaction pooling) happened to hand out, then leak to other clients
+    and be missing on the next transaction; there it's SET LOCAL at the
+    start of each transaction instead, one extra round trip apiece. Setting
+    it per role (ALTER ROLE ... SET statement_timeout) avoids that cost.
+    """
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if timeout_ms <= 0:
+        return
+
+    if settings.DB_PGBOUNCER:
+        @event.listens_for(sync_engine, "begin")
+        def set_local_statement_timeout(conn):
+            # The raw DBAPI cursor: not counted as a query of the request
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+            finally:
+                cursor.close()
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def set_statement_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SET statement_timeout = {int(timeout_ms)}")
+        finally:
+            cursor.close()
+        dbapi_connection.commit()
+
+
+def install_query_metrics(sync_engine) -> None:
+    """
+    Time every statement and add it to the current request's totals
+
+    Statements slower than SLOW_QUERY_MS are logged with their SQL text
+    (never the parameters) wherever they run.
+    """
+    slow_after = settings.SLOW_QUERY_MS / 1000 if settings.SLOW_QUERY_MS > 0 else None
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        DB_QUERY_DURATION.observe(elapsed)
+        stats = current_request_stats.get()
+        slow = slow_after is not None and elapsed >= slow_after
+        if slow:
+            where = stats.request if stats is not None else "outside a request"
+            logger.warning(f"Slow query ({elapsed * 1000:.1f} ms) in {where}: {compact_sql(statement)}")
+        if stats is not None:
+            stats.record_query(statement, elapsed, slow)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def discard_query_timer(exception_context):
+        starts = exception_context.connection.info.get("query_start_time") if exception_context.connection else None
+        if starts:
+            starts.pop()
@@ -0,0 +1,56 @@
+# app/db/routing.py
+import itertools
+import threading
+from sqlalchemy import Delete, Insert, Update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+
+class ReplicaSet:
+    """Picks a read replica engine: round_robin or least_connections"""
+
+    def __init__(self, engines: list[Engine], strategy: str = "round_robin"):
+        self.engines = engines
+        self.strategy = strategy
+        self._cycle = itertools.cycle(engines)
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> Engine:
+        if self.strategy == "least_connections":
+            return min(self.engines, key=lambda e: e.pool.checkedout())
+        with self._lock:
+            return next(self._cycle)
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from a replica and writes to the primary
+
+    One replica is chosen per session so reads stay consistent. Once the
+    session flushes or issues a write/locking statement it is pinned to the
+    primary, so reads later in the same request see their own writes.
+    """
+
+    def __init__(self, primary: Engine, replicas: ReplicaSet, **kwargs):
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replicas = replicas
+        self._replica: Engine | None = None
+        self.wrote = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if (
+            self.wrote
+            or self._flushing
+            or isinstance(clause, (Insert, Update, Delete))
+            or getattr(clause, "_for_update_arg", None) is not None
+            or not self.replicas
+        ):
+            self.wrote = True
+            return self.primary
+        if self._replica is None:
+            self._replica = self.replicas.choose()
+        return self._replica
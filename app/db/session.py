@@ -1,24 +1,273 @@
+import threading
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.db.pool import engine_options, install_query_metrics, install_statement_timeout
+from app.db.routing import ReplicaSet, RoutingSession
 
 SQLALCHEMY_DATABASE_URL = f"postgresql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+SQLALCHEMY_ASYNC_DATABASE_URL = f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Read replicas (DB_REPLICA_URLS), used by get_read_db
+REPLICA_DATABASE_URLS = [url.strip() for url in settings.DB_REPLICA_URLS.split(",") if url.strip()]
+
+# Built on first use (see get_engines), so importing the app neither loads the
+# DB drivers nor creates pools. Still importable by name from this module.
+_ENGINE_ATTRIBUTES = (
+    "engine", "SessionLocal", "async_engine", "AsyncSessionLocal",
+    "replica_engines", "replicas", "ReadSessionLocal",
+)
+
+
+def _create_replica_engine(url: str, is_async: bool):
+    if is_async:
+        async_url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        replica = create_async_engine(async_url, **engine_options(is_async=True))
+        install_statement_timeout(replica.sync_engine)
+        install_query_metrics(replica.sync_engine)
+    else:
+        replica = create_engine(url, **engine_options())
+        install_statement_timeout(replica)
+        install_query_metrics(replica)
+    return replica
+
+
+class Engines:
+    """Every engine and session factory of the process"""
+
+    def __init__(
+        self,
+        database_url: str = SQLALCHEMY_DATABASE_URL,
+        async_database_url: str = SQLALCHEMY_ASYNC_DATABASE_URL,
+    ):
+        # Sync engine: used by scripts and the DB_ASYNC=False fallback
+        self.engine = create_engine(database_url, **engine_options())
+        install_statement_timeout(self.engine)
+        install_query_metrics(self.engine)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+        # Async engine: asyncpg-backed, only built when DB_ASYNC is enabled
+        self.async_engine = (
+            create_async_engine(async_database_url, **engine_options(is_async=True))
+            if settings.DB_ASYNC
+            else None
+        )
+        if self.async_engine is not None:
+            install_statement_timeout(self.async_engine.sync_engine)
+            install_query_metrics(self.async_engine.sync_engine)
+        self.AsyncSessionLocal = (
+            async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+            if self.async_engine is not None
+            else None
+        )
+
+        is_async = self.async_engine is not None
+        self.replica_engines = [_create_replica_engine(url, is_async) for url in REPLICA_DATABASE_URLS]
+        # Sessions route on sync Engine objects (AsyncEngine.sync_engine in async mode)
+        self.replicas = ReplicaSet(
+            [getattr(replica, "sync_engine", replica) for replica in self.replica_engines],
+            strategy=settings.DB_REPLICA_STRATEGY,
+        )
+        if is_async:
+            self.ReadSessionLocal = async_sessionmaker(
+                autoflush=False,
+                expire_on_commit=False,
+                sync_session_class=RoutingSession,
+                primary=self.async_engine.sync_engine,
+                replicas=self.replicas,
+            )
+        else:
+            self.ReadSessionLocal = sessionmaker(
+                class_=RoutingSession,
+                autoflush=False,
+                primary=self.engine,
+                replicas=self.replicas,
+            )
+
+
+_engines: Optional[Engines] = None
+_engines_lock = threading.Lock()
+
+
+def get_engines() -> Engines:
+    """The process's engines, created on first call"""
+    global _engines
+    if _engines is None:
+        with _engines_lock:
+            if _engines is None:
+                _engines = Engines()
+    return _engines
+
+
+def configure_engines(database_url: str, async_database_url: str) -> Engines:
+    """
+    Use another database than the DB_* settings (benchmarks, local stand-ins)
+
+    Must run before anything touches the database.
+    """
+    global _engines
+    with _engines_lock:
+        if _engines is not None:
+            raise RuntimeError("Engines are already created")
+        _engines = Engines(database_url, async_database_url)
+    return _engines
+
+
+def __getattr__(name: str):
+    # `from app.db.session import engine` etc. keep working, lazily
+    if name in _ENGINE_ATTRIBUTES:
+        return getattr(get_engines(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 Base = declarative_base()
 
+
+class _ThreadpoolStreamResult:
+    """Async partitions() over a server-side cursor of a sync Session"""
+
+    def __init__(self, result):
+        self._result = result
+
+    async def partitions(self, size=None):
+        while True:
+            rows = await run_in_threadpool(self._result.fetchmany, size)
+            if not rows:
+                break
+            yield rows
+
+
+class SyncSessionAdapter:
+    """
+    Exposes the AsyncSession API on top of a sync Session.
+
+    Lets services and endpoints be written once against AsyncSession while
+    DB_ASYNC=False still works: every blocking call runs in the threadpool
+    instead of on the event loop.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, params, **kwargs)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, params, **kwargs)
+
+    async def stream(self, statement, params=None, **kwargs):
+        result = await run_in_threadpool(
+            self.sync_session.execute,
+            statement.execution_options(stream_results=True),
+            params,
+            **kwargs
+        )
+        return _ThreadpoolStreamResult(result)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance, attribute_names=None) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
 # Dependency
-def get_db():
-    db = SessionLocal()
+async def get_db():
+    """Yield an AsyncSession (or the sync adapter when DB_ASYNC=False)"""
+    engines = get_engines()
+    if engines.AsyncSessionLocal is not None:
+        async with engines.AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = SyncSessionAdapter(engines.SessionLocal())
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_read_db():
+    """
+    Like get_db, but reads go to a replica (falls back to the primary when no
+    replicas are configured, and after the session's first write)
+    """
+    if not REPLICA_DATABASE_URLS:
+        async for db in get_db():
+            yield db
+        return
+
+    engines = get_engines()
+    if engines.async_engine is not None:
+        async with engines.ReadSessionLocal() as db:
+            yield db
+        return
+
+    db = SyncSessionAdapter(engines.ReadSessionLocal())
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+@asynccontextmanager
+async def session_scope(read_only: bool = False):
+    """Standalone session for background work outside a request"""
+    async for db in (get_read_db() if read_only else get_db()):
+        yield db
 
 
 def create_all_tables():
-    """Create all database tables"""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    """Create all database tables (development only; production uses Alembic)"""
+    Base.metadata.create_all(bind=get_engines().engine)
+
+
+def pool_stats() -> dict:
+    """Connection pool gauges and checkout latency for each engine in use"""
+    if _engines is None:
+        return {}
+    stats = {"sync": _engines.engine.pool.stats()}
+    if _engines.async_engine is not None:
+        stats["async"] = _engines.async_engine.pool.stats()
+    for index, replica in enumerate(_engines.replicas.engines):
+        stats[f"replica_{index}"] = replica.pool.stats()
+    return stats
+
+
+async def dispose_engines():
+    """Close pooled connections on shutdown"""
+    if _engines is None:
+        return
+    if _engines.async_engine is not None:
+        await _engines.async_engine.dispose()
+    _engines.engine.dispose()
+    for replica in _engines.replica_engines:
+        if isinstance(replica, AsyncEngine):
+            await replica.dispose()
+        else:
+            replica.dispose()
@@ -0,0 +1,57 @@
+from enum import Enum
+from sqlalchemy import (
+    CheckConstraint, Column, DateTime, ForeignKey, Index, Integer, Numeric, UniqueConstraint,
+    Enum as SQLEnum, func
+)
+from app.db.session import Base
+
+class OrderStatus(str, Enum):
+    PLACED = "placed"
+    CANCELLED = "cancelled"
+
+class Inventory(Base):
+    """Sellable stock per product; decremented atomically at checkout"""
+    __tablename__ = "inventory"
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    available = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        CheckConstraint("available >= 0", name="ck_inventory_available_non_negative"),
+    )
+
+class CartItem(Base):
+    __tablename__ = "cart_items"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "product_id", name="uq_cart_items_user_product"),
+        CheckConstraint("quantity > 0", name="ck_cart_items_quantity_positive"),
+    )
+
+class Order(Base):
+    __tablename__ = "orders"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    status = Column(SQLEnum(OrderStatus), nullable=False, default=OrderStatus.PLACED)
+    total = Column(Numeric(12, 2), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # "My orders", newest first, keyset by id
+        Index("ix_orders_user_id_id", "user_id", "id"),
+    )
+
+class OrderItem(Base):
+    __tablename__ = "order_items"
+
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="RESTRICT"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    unit_price = Column(Numeric(12, 2), nullable=False)
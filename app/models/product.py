@@ -0,0 +1,54 @@
+from sqlalchemy import (
+    DDL, Boolean, Column, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, event, func, text
+)
+from app.db.session import Base
+
+# Expression indexed by ix_products_search; queries must use the same expression
+SEARCH_DOCUMENT = "to_tsvector('english', name || ' ' || coalesce(description, ''))"
+
+class Category(Base):
+    __tablename__ = "categories"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    slug = Column(String, unique=True, index=True, nullable=False)
+    parent_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+
+class Product(Base):
+    __tablename__ = "products"
+
+    id = Column(Integer, primary_key=True)
+    # NULL once the seller's account is deleted; the product stays for its order items
+    seller_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+    sku = Column(String, unique=True, nullable=False)
+    name = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    price = Column(Numeric(12, 2), nullable=False)
+    is_active = Column(Boolean, nullable=False, default=True, server_default=text("true"))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Keyset pages per category / per seller, active products only
+        Index(
+            "ix_products_category_id_id", "category_id", "id",
+            postgresql_where=text("is_active")
+        ),
+        Index("ix_products_seller_id_id", "seller_id", "id"),
+        # Full-text search (websearch_to_tsquery) and substring/fuzzy name match
+        # (pg_trgm); PostgreSQL only, skipped by create_all on other databases
+        Index("ix_products_search", text(SEARCH_DOCUMENT), postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index(
+            "ix_products_name_trgm", "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
+# ix_products_name_trgm needs pg_trgm when tables are created with create_all
+event.listen(
+    Product.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
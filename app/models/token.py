@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, Index, String
+from app.db.session import Base
+
+class RevokedToken(Base):
+    """Denylist entry: tokens matching `key` issued at or before revoked_at are rejected"""
+    __tablename__ = "revoked_tokens"
+
+    # "jti:<token id>", "fam:<login session id>", "sub:<email>" or
+    # "tv:<email>:<token_version>"
+    key = Column(String, primary_key=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=False)
+    # No token matching the key outlives this; the row is purged afterwards
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # Incremental sync of other instances' revocations / expiry purge
+        Index("ix_revoked_tokens_revoked_at", "revoked_at"),
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
@@ -1,5 +1,5 @@
 from enum import Enum
-from sqlalchemy import Column, String, Boolean, Integer,  Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, Index, Integer,  Enum as SQLEnum, text
 from app.db.session import Base
 
 class UserRole(str, Enum):
@@ -12,11 +12,30 @@ class User(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     role = Column(SQLEnum(UserRole), default=UserRole.USER)
-    email = Column(String, unique=True, index=True)
+    # Unique via ix_users_email_login below
+    email = Column(String)
     password = Column(String)
     username = Column(String, unique=True)
     is_active = Column(Boolean, default=True)
     first_name = Column(String, nullable=True)
     last_name = Column(String, nullable=True)
     phone_number = Column(String, nullable=True)
-    avatar_url = Column(String, nullable=True)
\ No newline at end of file
+    avatar_url = Column(String, nullable=True)
+    # Bumped by every ORM update of the row; the ETag of profile reads
+    version = Column(Integer, nullable=False, server_default=text("1"))
+    # Bumped when role or is_active change; tokens carry it as `tv` and are
+    # revoked with the version they were issued for
+    token_version = Column(Integer, nullable=False, server_default=text("0"))
+
+    __table_args__ = (
+        # Login lookup by email as an index-only scan (PostgreSQL INCLUDE)
+        Index(
+            "ix_users_email_login", "email",
+            unique=True,
+            postgresql_include=["id", "password", "role", "is_active", "token_version"]
+        ),
+        # Keyset pagination with role / is_active filters (GET /users)
+        Index("ix_users_role_id", "role", "id"),
+        Index("ix_users_is_active_id", "is_active", "id"),
+    )
+    __mapper_args__ = {"version_id_col": version}
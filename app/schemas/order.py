@@ -0,0 +1,34 @@
+from datetime import datetime
+from decimal import Decimal
+from pydantic import BaseModel, Field
+
+class CartItemUpdate(BaseModel):
+    quantity: int = Field(..., ge=0, le=1000, description="0 removes the item")
+
+class CartItemOut(BaseModel):
+    product_id: int
+    quantity: int
+    unit_price: Decimal
+    name: str
+
+class CartOut(BaseModel):
+    items: list[CartItemOut]
+    total: Decimal
+
+class OrderItemOut(BaseModel):
+    product_id: int
+    quantity: int
+    unit_price: Decimal
+
+    class Config:
+        from_attributes = True
+
+class OrderOut(BaseModel):
+    id: int
+    status: str
+    total: Decimal
+    created_at: datetime
+    items: list[OrderItemOut]
+
+class StockUpdate(BaseModel):
+    available: int = Field(..., ge=0)
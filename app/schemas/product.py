@@ -0,0 +1,46 @@
+from datetime import datetime
+from decimal import Decimal
+from pydantic import BaseModel, Field
+
+class CategoryCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    slug: str = Field(..., min_length=1, max_length=100, pattern=r"^[a-z0-9-]+$")
+    parent_id: int | None = None
+
+class CategoryOut(CategoryCreate):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+class ProductBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=200)
+    description: str | None = Field(None, max_length=5000)
+    price: Decimal = Field(..., gt=0, max_digits=12, decimal_places=2)
+    category_id: int | None = None
+    is_active: bool = True
+
+class ProductCreate(ProductBase):
+    sku: str = Field(..., min_length=1, max_length=64)
+
+class ProductUpdate(BaseModel):
+    name: str | None = Field(None, min_length=1, max_length=200)
+    description: str | None = Field(None, max_length=5000)
+    price: Decimal | None = Field(None, gt=0, max_digits=12, decimal_places=2)
+    category_id: int | None = None
+    is_active: bool | None = None
+
+class ProductOut(ProductBase):
+    id: int
+    sku: str
+    seller_id: int | None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ProductListResponse(BaseModel):
+    """A keyset page of products"""
+    items: list[ProductOut]
+    next_cursor: int | None = None
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, EmailStr, Field
+from typing import Any
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from app.models.user import UserRole
 
 class UserCreate(BaseModel):
     """Schema for creating a user (input)"""
@@ -16,4 +18,31 @@ class UserOut(BaseModel):
     # is_active: bool
     
     class Config:
-        from_attributes = True  # Allows ORM model -> Pydantic conversion
\ No newline at end of file
+        from_attributes = True  # Allows ORM model -> Pydantic conversion
+
+class UserListResponse(BaseModel):
+    """A page of users with only the requested fields"""
+    items: list[dict[str, Any]]
+    next_cursor: int | None = None
+
+class UserAccessUpdate(BaseModel):
+    """Role / activation change by an admin; omitted fields stay as they are"""
+    role: UserRole | None = None
+    is_active: bool | None = None
+
+    @field_validator("role", "is_active")
+    @classmethod
+    def not_null(cls, value):
+        # Only runs for fields that were sent: omitting one is fine, null is not
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+class UserAccessOut(BaseModel):
+    id: int
+    role: str
+    is_active: bool
+    token_version: int
+
+    class Config:
+        from_attributes = True
@@ -1,34 +1,86 @@
 # app/services/auth_service.py
+import asyncio
+import logging
+from typing import NamedTuple
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from app.models.user import User
-from app.utils.security import verify_password, hash_password  # Import from your utils
+from sqlalchemy import select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import session_scope
+from app.models.user import User, UserRole
+from app.services.password_service import password_hasher
+from app.utils.security import password_needs_update
 
-def get_user_by_email(db: Session, email: str) -> User | None:
+logger = logging.getLogger(__name__)
+
+# Strong references so scheduled rehash tasks aren't garbage collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+# Login needs only these; together with the key they are exactly the columns of
+# ix_users_email_login, so the lookup is an index-only scan
+CREDENTIAL_COLUMNS = (User.id, User.email, User.password, User.role, User.is_active, User.token_version)
+
+
+class Identity(NamedTuple):
+    """The caller as access checks see it: plain values, no ORM entity"""
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool
+    token_version: int
+
+
+IDENTITY_COLUMNS = (User.id, User.email, User.role, User.is_active, User.token_version)
+
+
+def token_claims(user) -> dict:
+    """
+    Signed claims for a user (a User, Identity or credentials row); enough
+    for get_current_principal to authorize without the database
+    """
+    return {"sub": user.email, "role": user.role.value, "uid": user.id, "tv": user.token_version}
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     """Get user by email from database"""
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
-def authenticate_user(
-    db: Session, 
+
+async def get_credentials_by_email(db: AsyncSession, email: str) -> Row | None:
+    """Row of CREDENTIAL_COLUMNS for a login, or None"""
+    result = await db.execute(select(*CREDENTIAL_COLUMNS).where(User.email == email))
+    return result.first()
+
+
+async def get_identity_by_email(db: AsyncSession, email: str) -> Identity | None:
+    """Identity for a token subject, read as a tuple without hydrating a User"""
+    result = await db.execute(select(*IDENTITY_COLUMNS).where(User.email == email))
+    row = result.first()
+    return Identity(*row) if row is not None else None
+
+async def authenticate_user(
+    db: AsyncSession, 
     email: str, 
     password: str
-) -> User:
+) -> Row:
     """
     Authenticate a user with email and password
-    Returns User object if valid, raises HTTPException otherwise
+    Returns the credentials row if valid, raises HTTPException otherwise
     
     Args:
-        db: SQLAlchemy session
+        db: SQLAlchemy async session
         email: User's email
         password: Plain text password
         
     Returns:
-        Authenticated User object
+        Row of CREDENTIAL_COLUMNS
         
     Raises:
-        HTTPException: 401 for invalid credentials, 400 for inactive users
+        HTTPException: 401 for invalid credentials, 400 for inactive users,
+            503 when the password hashing pool is saturated
     """
-    user = get_user_by_email(db, email)
+    user = await get_credentials_by_email(db, email)
     
     # Check user exists
     if not user:
@@ -38,8 +90,8 @@ def authenticate_user(
             # headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Verify password (using your existing utility)
-    if not verify_password(password, user.password):
+    # Verify password on the hashing pool so bcrypt never blocks the event loop
+    if not await password_hasher.verify(password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Password does not match",
@@ -53,4 +105,36 @@ def authenticate_user(
             detail="Inactive user account",
         )
     
-    return user
\ No newline at end of file
+    # Upgrade hashes made with an old scheme/cost without delaying the response
+    if password_needs_update(user.password):
+        schedule_rehash(user.email, user.password, password)
+
+    return user
+
+
+async def rehash_password(email: str, old_hash: str, password: str) -> None:
+    """
+    Re-hash a password with the current policy and store it
+
+    The update only applies while the stored hash is still `old_hash`, so a
+    password change that lands in between is never overwritten.
+    """
+    try:
+        new_hash = await password_hasher.hash(password)
+        async with session_scope() as db:
+            await db.execute(
+                update(User)
+                .where(User.email == email, User.password == old_hash)
+                .values(password=new_hash)
+            )
+            await db.commit()
+        logger.info(f"Rehashed password for {email}")
+    except Exception as e:
+        logger.warning(f"Password rehash failed for {email}: {str(e)}")
+
+
+def schedule_rehash(email: str, old_hash: str, password: str) -> None:
+    """Run rehash_password in the background on the running event loop"""
+    task = asyncio.create_task(rehash_password(email, old_hash, password))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
\ No newline at end of file
@@ -0,0 +1,123 @@
+# app/services/avatar_service.py
+import logging
+import os
+import tempfile
+import time
+from typing import BinaryIO
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.services.image_service import image_pool
+from app.services.storage import image_storage
+
+logger = logging.getLogger(__name__)
+
+
+def spool_to_temp_file(source: BinaryIO, max_bytes: int, chunk_size: int) -> str:
+    """
+    Copy an upload to a named temp file in fixed-size chunks
+
+    For the image process pool, which takes a path. Memory per request
+    stays at one chunk regardless of the upload size.
+
+    Returns:
+        str: Path of the temp file (the caller removes it)
+
+    Raises:
+        HTTPException: 413 when the upload is larger than max_bytes
+    """
+    source.seek(0)
+    written = 0
+    with tempfile.NamedTemporaryFile(prefix="avatar-", delete=False) as target:
+        try:
+            while chunk := source.read(chunk_size):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Avatar must be at most {max_bytes // 1024} KB"
+                    )
+                target.write(chunk)
+        except BaseException:
+            target.close()
+            os.unlink(target.name)
+            raise
+    return target.name
+
+
+async def upload_avatar(file: UploadFile, folder: str) -> str:
+    """
+    Push an avatar upload to the image storage backend, optionally shrinking
+    it locally first (AVATAR_PREPROCESS, in the image process pool). Nothing
+    here blocks the event loop.
+
+    Starlette's multipart parser has already received the upload into a
+    spooled temp file; oversized requests that declare their length are
+    refused before that by BodySizeLimitMiddleware. The spooled file goes to
+    storage as is; it is only copied to a named temp file for the process pool.
+
+    Returns:
+        str: Secure URL of the uploaded image
+    """
+    if file.size is not None and file.size > settings.AVATAR_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Avatar must be at most {settings.AVATAR_MAX_BYTES // 1024} KB"
+        )
+
+    if not settings.AVATAR_PREPROCESS:
+        await file.seek(0)
+        return await run_in_threadpool(image_storage.upload, file.file, folder)
+
+    path = await run_in_threadpool(
+        spool_to_temp_file,
+        file.file,
+        settings.AVATAR_MAX_BYTES,
+        settings.AVATAR_CHUNK_SIZE,
+    )
+    try:
+        try:
+            processed_path = await image_pool.preprocess(path)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Image upload failed. Please try another image."
+            )
+        try:
+            return await run_in_threadpool(image_storage.upload, processed_path, folder, True)
+        finally:
+            await run_in_threadpool(os.unlink, processed_path)
+    finally:
+        await run_in_threadpool(os.unlink, path)
+
+
+def delete_image_with_retry(
+    url: str,
+    retries: int = 3,
+    backoff: float = 1.0
+) -> bool:
+    """
+    Deletes a stored image, retrying with exponential backoff
+
+    Meant to run as a background task, so it logs instead of raising.
+
+    Args:
+        url: Public URL of the image
+        retries: Number of attempts
+        backoff: Seconds to wait before the second attempt (doubles each time)
+
+    Returns:
+        bool: True if the image was deleted
+    """
+    for attempt in range(1, retries + 1):
+        try:
+            return image_storage.delete(url)
+        except (HTTPException, OSError) as e:
+            # HTTPException from Cloudinary, OSError from local storage
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            if attempt == retries:
+                logger.error(f"Giving up deleting image after {retries} attempts: {url} ({detail})")
+                return False
+            logger.warning(f"Deleting image failed (attempt {attempt}/{retries}): {url} ({detail})")
+            time.sleep(backoff * 2 ** (attempt - 1))
+    return False
@@ -0,0 +1,171 @@
+# app/services/bulk_import_service.py
+import csv
+import io
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.engine import Connection, Engine
+from app.models.user import User, UserRole
+from app.schemas.user import UserCreate
+from app.utils import security
+
+logger = logging.getLogger(__name__)
+
+IMPORT_COLUMNS = ("email", "password", "username", "first_name")
+
+# Per-worker hashing context, set up by _init_hash_worker
+_worker_context = None
+
+
+def _init_hash_worker(bcrypt_rounds: int | None) -> None:
+    global _worker_context
+    context = security.pwd_context
+    if bcrypt_rounds is not None:
+        context = context.copy(bcrypt__rounds=bcrypt_rounds)
+    _worker_context = context
+
+
+def _hash_in_worker(password: str) -> str:
+    return _worker_context.hash(password)
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """Stream records from a .csv (with header) or .jsonl file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if Path(path).suffix.lower() == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _chunks(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(records)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _write_copy(connection: Connection, rows: list[dict]) -> int:
+    """COPY into a temp table, then merge into users skipping existing emails/usernames"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([row[column] for column in IMPORT_COLUMNS] for row in rows)
+    buffer.seek(0)
+
+    raw = connection.connection.dbapi_connection
+    with raw.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMP TABLE users_import "
+            "(email varchar, password varchar, username varchar, first_name varchar) "
+            "ON COMMIT DROP"
+        )
+        cursor.copy_expert(
+            f"COPY users_import ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+        cursor.execute(
+            f"INSERT INTO users ({', '.join(IMPORT_COLUMNS)}, role, is_active) "
+            f"SELECT {', '.join(IMPORT_COLUMNS)}, %s, true FROM users_import "
+            "ON CONFLICT DO NOTHING",
+            (UserRole.USER.name,)
+        )
+        return cursor.rowcount
+
+
+def _write_insert(connection: Connection, rows: list[dict]) -> int:
+    """Batched executemany insert skipping existing emails/usernames"""
+    values = [{**row, "role": UserRole.USER, "is_active": True} for row in rows]
+    stmt = insert(User.__table__)
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        stmt = pg_insert(User.__table__).on_conflict_do_nothing()
+    elif connection.dialect.name == "sqlite":
+        stmt = stmt.prefix_with("OR IGNORE")
+    result = connection.execute(stmt.returning(User.__table__.c.id), values)
+    return len(result.all())
+
+
+def import_users(
+    engine: Engine,
+    path: str,
+    chunk_size: int = 1000,
+    workers: int | None = None,
+    method: str = "copy",
+    bcrypt_rounds: int | None = None
+) -> dict:
+    """
+    Bulk-load users from a CSV/JSONL file
+
+    Records are validated with UserCreate, de-duplicated by email and
+    username within the file, hashed on a process pool and written one chunk
+    per transaction with COPY (PostgreSQL + psycopg2) or batched inserts.
+    Users that already exist are skipped.
+
+    Args:
+        engine: Sync engine to write with
+        path: .csv or .jsonl file with email, password, username[, first_name]
+        chunk_size: Records per hashing batch and transaction
+        workers: Hashing processes (default: CPU count)
+        method: "copy" or "insert"
+        bcrypt_rounds: Hash with a cheaper bcrypt cost; the stored hashes are
+            upgraded to the configured cost on each user's first login
+
+    Returns:
+        dict: read / invalid / duplicate / inserted / skipped_existing counts
+    """
+    if method == "copy" and engine.dialect.driver != "psycopg2":
+        logger.warning(f"COPY needs psycopg2 (got {engine.dialect.driver}); using batched inserts")
+        method = "insert"
+    write = _write_copy if method == "copy" else _write_insert
+
+    workers = workers or os.cpu_count() or 1
+    stats = {"read": 0, "invalid": 0, "duplicate": 0, "inserted": 0, "skipped_existing": 0}
+    seen_emails: set[str] = set()
+    seen_usernames: set[str] = set()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_hash_worker,
+        initargs=(bcrypt_rounds,)
+    ) as executor:
+        for chunk in _chunks(read_records(path), chunk_size):
+            rows = []
+            for record in chunk:
+                stats["read"] += 1
+                try:
+                    user = UserCreate(**record)
+                except ValidationError as e:
+                    stats["invalid"] += 1
+                    logger.debug(f"Skipping invalid record {stats['read']}: {e.errors()}")
+                    continue
+                if user.email in seen_emails or user.username in seen_usernames:
+                    stats["duplicate"] += 1
+                    continue
+                seen_emails.add(user.email)
+                seen_usernames.add(user.username)
+                rows.append(user.model_dump(include=set(IMPORT_COLUMNS)))
+
+            if not rows:
+                continue
+
+            hashes = executor.map(
+                _hash_in_worker,
+                [row["password"] for row in rows],
+                chunksize=max(len(rows) // (workers * 4), 1)
+            )
+            for row, hashed in zip(rows, hashes):
+                row["password"] = hashed
+
+            with engine.begin() as connection:
+                inserted = write(connection, rows)
+            stats["inserted"] += inserted
+            stats["skipped_existing"] += len(rows) - inserted
+            logger.info(f"Imported {stats['inserted']} users ({stats['read']} records read)")
+
+    return stats
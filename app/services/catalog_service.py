@@ -0,0 +1,217 @@
+# app/services/catalog_service.py
+import uuid
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, literal_column, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import build_cache_backend
+from app.core.config import settings
+from app.models.order import CartItem
+from app.models.product import SEARCH_DOCUMENT, Category, Product
+from app.services.auth_service import Identity
+from app.schemas.product import CategoryCreate, ProductCreate, ProductOut, ProductUpdate
+
+catalog_cache = build_cache_backend(
+    settings.CATALOG_CACHE_BACKEND,
+    max_size=settings.CATALOG_CACHE_MAX_SIZE,
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+    prefix="catalog:",
+)
+
+ALL_CATEGORIES = "all"
+
+
+async def _listing_version(scope) -> str:
+    """
+    Current cache version of a category's listing pages
+
+    Cached pages embed the version in their key; bumping it orphans every
+    page of that category at once. A missing version gets a fresh random one,
+    so pages cached under an evicted version can never be served again.
+    """
+    key = f"version:{scope}"
+    data = await catalog_cache.get(key)
+    if data is None:
+        data = {"v": uuid.uuid4().hex}
+        await catalog_cache.set(key, data, ttl=settings.CATALOG_CACHE_TTL_SECONDS * 2)
+    return data["v"]
+
+
+async def invalidate_listings(*category_ids: int | None) -> None:
+    """Drop cached listing pages for the given categories and the unfiltered listing"""
+    for scope in {*(c for c in category_ids if c is not None), ALL_CATEGORIES}:
+        await catalog_cache.set(
+            f"version:{scope}",
+            {"v": uuid.uuid4().hex},
+            ttl=settings.CATALOG_CACHE_TTL_SECONDS * 2
+        )
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards (and the escape character) in user input"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def _query_products(
+    db: AsyncSession,
+    category_id: int | None,
+    seller_id: int | None,
+    q: str | None,
+    after_id: int | None,
+    limit: int
+) -> dict:
+    stmt = select(Product).where(Product.is_active).order_by(Product.id).limit(limit + 1)
+    if after_id is not None:
+        stmt = stmt.where(Product.id > after_id)
+    if category_id is not None:
+        stmt = stmt.where(Product.category_id == category_id)
+    if seller_id is not None:
+        stmt = stmt.where(Product.seller_id == seller_id)
+    if q:
+        # Rendered literally so the planner matches the ix_products_search expression
+        document = literal_column(SEARCH_DOCUMENT)
+        query = func.websearch_to_tsquery(literal_column("'english'::regconfig"), q)
+        stmt = stmt.where(or_(
+            document.op("@@")(query),
+            # Substring/typo-ish matches via pg_trgm; q's own % and _ match literally
+            Product.name.ilike(f"%{_escape_like(q)}%", escape="\\"),
+        ))
+
+    products = (await db.execute(stmt)).scalars().all()
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = products[-1].id
+    return {
+        "items": [ProductOut.model_validate(p).model_dump(mode="json") for p in products],
+        "next_cursor": next_cursor,
+    }
+
+
+async def list_products(
+    db: AsyncSession,
+    category_id: int | None = None,
+    seller_id: int | None = None,
+    q: str | None = None,
+    after_id: int | None = None,
+    limit: int = 50
+) -> dict:
+    """
+    One keyset page of active products ordered by id
+
+    Plain category pages (and the unfiltered listing) are served from the
+    catalog cache; searches and per-seller listings always hit the database.
+
+    Returns:
+        dict: {"items": [...], "next_cursor": int | None}
+    """
+    if q or seller_id is not None:
+        return await _query_products(db, category_id, seller_id, q, after_id, limit)
+
+    scope = category_id if category_id is not None else ALL_CATEGORIES
+    version = await _listing_version(scope)
+    key = f"page:{scope}:{version}:{after_id}:{limit}"
+    page = await catalog_cache.get(key)
+    if page is None:
+        page = await _query_products(db, category_id, None, None, after_id, limit)
+        await catalog_cache.set(key, page)
+    return page
+
+
+async def get_product(db: AsyncSession, product_id: int) -> Product:
+    product = await db.get(Product, product_id)
+    if product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return product
+
+
+async def _ensure_category(db: AsyncSession, category_id: int | None) -> None:
+    if category_id is not None and await db.get(Category, category_id) is None:
+        raise HTTPException(status_code=400, detail="Category does not exist")
+
+
+def ensure_can_edit(user: Identity, product: Product) -> None:
+    """Sellers may only change their own products; admins may change any"""
+    if user.role != "admin" and product.seller_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only modify your own products"
+        )
+
+
+async def create_product(db: AsyncSession, seller: Identity, data: ProductCreate) -> Product:
+    await _ensure_category(db, data.category_id)
+    if await db.scalar(select(Product.id).where(Product.sku == data.sku)) is not None:
+        raise HTTPException(status_code=400, detail="SKU already exists")
+
+    product = Product(**data.model_dump(), seller_id=seller.id)
+    db.add(product)
+    await db.commit()
+    await db.refresh(product)
+    await invalidate_listings(product.category_id)
+    return product
+
+
+async def update_product(db: AsyncSession, product: Product, data: ProductUpdate) -> Product:
+    changes = data.model_dump(exclude_unset=True)
+    if "category_id" in changes:
+        await _ensure_category(db, changes["category_id"])
+
+    old_category_id = product.category_id
+    for field, value in changes.items():
+        setattr(product, field, value)
+    await db.commit()
+    await db.refresh(product)
+    await invalidate_listings(old_category_id, product.category_id)
+    return product
+
+
+async def delete_product(db: AsyncSession, product: Product) -> None:
+    """
+    Unlist a product and take it out of every cart
+
+    The row stays (is_active=False), as order items keep referencing the
+    products they were placed for (order_items.product_id is ON DELETE RESTRICT).
+    """
+    category_id = product.category_id
+    product.is_active = False
+    await db.execute(delete(CartItem).where(CartItem.product_id == product.id))
+    await db.commit()
+    await invalidate_listings(category_id)
+
+
+
+async def unlist_seller_products(db: AsyncSession, seller_id: int) -> set[int | None]:
+    """
+    Unlist every product of a seller whose account is being deleted
+
+    Part of the caller's transaction (no commit). Returns the categories
+    whose cached listings the caller invalidates once it has committed.
+    """
+    rows = (await db.execute(
+        update(Product)
+        .where(Product.seller_id == seller_id, Product.is_active)
+        .values(is_active=False)
+        .returning(Product.category_id)
+        .execution_options(synchronize_session=False)
+    )).all()
+    await db.execute(
+        delete(CartItem).where(
+            CartItem.product_id.in_(select(Product.id).where(Product.seller_id == seller_id))
+        )
+    )
+    return {row.category_id for row in rows}
+
+async def list_categories(db: AsyncSession) -> list[Category]:
+    return (await db.execute(select(Category).order_by(Category.name))).scalars().all()
+
+
+async def create_category(db: AsyncSession, data: CategoryCreate) -> Category:
+    await _ensure_category(db, data.parent_id)
+    if await db.scalar(select(Category.id).where(Category.slug == data.slug)) is not None:
+        raise HTTPException(status_code=400, detail="Category slug already exists")
+
+    category = Category(**data.model_dump())
+    db.add(category)
+    await db.commit()
+    await db.refresh(category)
+    return category
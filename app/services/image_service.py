@@ -0,0 +1,81 @@
+# app/services/image_service.py
+import asyncio
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from app.core.config import settings
+
+
+def preprocess_image(path: str, size: int = 250, quality: int = 80) -> str:
+    """
+    Decode, EXIF-orient, center-crop/downscale to size x size and re-encode
+    as WebP. Runs in a worker process.
+
+    Args:
+        path: Source image file
+        size: Target width and height in pixels (same result as Cloudinary's crop="fill")
+        quality: WebP quality
+
+    Returns:
+        str: Path of the WebP temp file (the caller removes it)
+
+    Raises:
+        ValueError: If the file is not a decodable image
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError  # optional dependency
+
+    out_path = None
+    try:
+        with Image.open(path) as image:
+            # Let the decoder downscale JPEGs while decoding; much cheaper than a full decode
+            image.draft("RGB", (size, size))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+            image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            fd, out_path = tempfile.mkstemp(prefix="avatar-", suffix=".webp")
+            with os.fdopen(fd, "wb") as out:
+                image.save(out, format="WEBP", quality=quality, method=4)
+    # DecompressionBombError (oversized or crafted images) is not an OSError;
+    # Pillow raises ValueError for some malformed headers
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError) as e:
+        if out_path is not None:
+            os.unlink(out_path)
+        raise ValueError(f"Unsupported image: {str(e)}")
+    return out_path
+
+
+class ImageProcessingPool:
+    """Lazily created process pool for CPU-heavy image work"""
+
+    def __init__(self, workers: int = 0):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def preprocess(self, path: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            preprocess_image,
+            path,
+            settings.AVATAR_SIZE,
+            settings.AVATAR_WEBP_QUALITY,
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+image_pool = ImageProcessingPool(workers=settings.IMAGE_PROCESS_WORKERS)
@@ -0,0 +1,201 @@
+# app/services/order_service.py
+from decimal import Decimal
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.order import CartItem, Inventory, Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.user import User
+
+
+async def get_cart(db: AsyncSession, user: User) -> dict:
+    rows = (await db.execute(
+        select(CartItem.product_id, CartItem.quantity, Product.price, Product.name)
+        .join(Product, Product.id == CartItem.product_id)
+        .where(CartItem.user_id == user.id)
+        .order_by(CartItem.product_id)
+    )).all()
+    items = [
+        {"product_id": r.product_id, "quantity": r.quantity, "unit_price": r.price, "name": r.name}
+        for r in rows
+    ]
+    return {"items": items, "total": sum((r.price * r.quantity for r in rows), Decimal("0"))}
+
+
+async def set_cart_item(db: AsyncSession, user: User, product_id: int, quantity: int) -> dict:
+    """Set the quantity of a product in the cart; 0 removes it"""
+    item = await db.scalar(
+        select(CartItem).where(CartItem.user_id == user.id, CartItem.product_id == product_id)
+    )
+    if quantity == 0:
+        if item is not None:
+            await db.delete(item)
+    else:
+        product = await db.get(Product, product_id)
+        if product is None or not product.is_active:
+            raise HTTPException(status_code=404, detail="Product not found")
+        if item is None:
+            db.add(CartItem(user_id=user.id, product_id=product_id, quantity=quantity))
+        else:
+            item.quantity = quantity
+    await db.commit()
+    return await get_cart(db, user)
+
+
+def _order_to_dict(order: Order, items: list[OrderItem]) -> dict:
+    return {
+        "id": order.id,
+        "status": order.status.value,
+        "total": order.total,
+        "created_at": order.created_at,
+        "items": items,
+    }
+
+
+async def checkout(db: AsyncSession, user: User) -> dict:
+    """
+    Turn the cart into an order, reserving stock without overselling
+
+    Each line is reserved with one conditional UPDATE
+    (available = available - qty WHERE available >= qty), so concurrent
+    checkouts of the same SKU can never drive stock negative and no
+    read-modify-write race exists. The cart rows are claimed first with
+    DELETE ... RETURNING and the order is built from what was actually
+    deleted: of two concurrent checkouts of the same cart (a double click,
+    a client retry) the second waits on the first's row locks, claims
+    nothing and is rejected. The hot inventory rows are touched last, in
+    product_id order, so their row locks are held only for the few
+    statements before COMMIT and lock order is deadlock-free.
+
+    Raises:
+        HTTPException: 400 for an empty cart, 409 when an item is out of
+            stock or the cart was checked out concurrently
+    """
+    prices = dict((await db.execute(
+        select(CartItem.product_id, Product.price)
+        .join(Product, Product.id == CartItem.product_id)
+        .where(CartItem.user_id == user.id, Product.is_active)
+    )).all())
+    if not prices:
+        raise HTTPException(status_code=400, detail="Cart is empty")
+
+    claimed = (await db.execute(
+        delete(CartItem)
+        .where(CartItem.user_id == user.id, CartItem.product_id.in_(prices))
+        .returning(CartItem.product_id, CartItem.quantity)
+        .execution_options(synchronize_session=False)
+    )).all()
+    if not claimed:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Cart was checked out concurrently"
+        )
+    lines = sorted(
+        (line.product_id, line.quantity, prices[line.product_id]) for line in claimed
+    )
+
+    order = Order(
+        user_id=user.id,
+        status=OrderStatus.PLACED,
+        total=sum((price * quantity for _, quantity, price in lines), Decimal("0")),
+    )
+    db.add(order)
+    await db.flush()
+    items = [
+        OrderItem(order_id=order.id, product_id=product_id, quantity=quantity, unit_price=price)
+        for product_id, quantity, price in lines
+    ]
+    db.add_all(items)
+
+    for product_id, quantity, _ in lines:
+        reserved = await db.execute(
+            update(Inventory)
+            .where(Inventory.product_id == product_id, Inventory.available >= quantity)
+            .values(available=Inventory.available - quantity)
+            .returning(Inventory.product_id)
+            .execution_options(synchronize_session=False)
+        )
+        if reserved.first() is None:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Insufficient stock for product {product_id}"
+            )
+
+    await db.commit()
+    await db.refresh(order)
+    return _order_to_dict(order, items)
+
+
+async def list_orders(db: AsyncSession, user: User, before_id: int | None = None, limit: int = 20) -> list[dict]:
+    stmt = select(Order).where(Order.user_id == user.id).order_by(Order.id.desc()).limit(limit)
+    if before_id is not None:
+        stmt = stmt.where(Order.id < before_id)
+    orders = (await db.execute(stmt)).scalars().all()
+    if not orders:
+        return []
+
+    items_by_order: dict[int, list[OrderItem]] = {order.id: [] for order in orders}
+    items = (await db.execute(
+        select(OrderItem).where(OrderItem.order_id.in_(items_by_order)).order_by(OrderItem.id)
+    )).scalars()
+    for item in items:
+        items_by_order[item.order_id].append(item)
+    return [_order_to_dict(order, items_by_order[order.id]) for order in orders]
+
+
+async def _get_own_order(db: AsyncSession, user: User, order_id: int) -> Order:
+    order = await db.get(Order, order_id)
+    if order is None or order.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return order
+
+
+async def _order_items(db: AsyncSession, order_id: int) -> list[OrderItem]:
+    return (await db.execute(
+        select(OrderItem).where(OrderItem.order_id == order_id).order_by(OrderItem.id)
+    )).scalars().all()
+
+
+async def get_order(db: AsyncSession, user: User, order_id: int) -> dict:
+    order = await _get_own_order(db, user, order_id)
+    return _order_to_dict(order, await _order_items(db, order_id))
+
+
+async def cancel_order(db: AsyncSession, user: User, order_id: int) -> dict:
+    """Cancel a placed order and return its stock"""
+    # Conditional status flip: two concurrent cancels can't both restock
+    cancelled = await db.execute(
+        update(Order)
+        .where(Order.id == order_id, Order.user_id == user.id, Order.status == OrderStatus.PLACED)
+        .values(status=OrderStatus.CANCELLED)
+        .returning(Order.id)
+        .execution_options(synchronize_session=False)
+    )
+    if cancelled.first() is None:
+        await _get_own_order(db, user, order_id)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Order cannot be cancelled")
+
+    items = await _order_items(db, order_id)
+    for item in sorted(items, key=lambda i: i.product_id):
+        await db.execute(
+            update(Inventory)
+            .where(Inventory.product_id == item.product_id)
+            .values(available=Inventory.available + item.quantity)
+            .execution_options(synchronize_session=False)
+        )
+    await db.commit()
+    order = await _get_own_order(db, user, order_id)
+    await db.refresh(order)
+    return _order_to_dict(order, items)
+
+
+async def set_stock(db: AsyncSession, product: Product, available: int) -> int:
+    inventory = await db.get(Inventory, product.id)
+    if inventory is None:
+        db.add(Inventory(product_id=product.id, available=available))
+    else:
+        inventory.available = available
+    await db.commit()
+    return available
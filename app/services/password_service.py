@@ -0,0 +1,140 @@
+# app/services/password_service.py
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_QUEUE_WAIT
+from app.utils import security
+
+logger = logging.getLogger(__name__)
+
+
+def _run_timed(func, *args):
+    """Run func in the worker and report when it started and how long it took"""
+    started_at = time.time()
+    result = func(*args)
+    return result, started_at, time.time() - started_at
+
+
+class _TimingStat:
+    """Running count/total/max of a duration in seconds"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class PasswordHashService:
+    """
+    Runs bcrypt hashing/verification on a bounded worker pool.
+
+    The event loop only awaits the result. Once `workers + max_queue` calls
+    are in flight, new calls are rejected with 503 instead of piling up.
+    """
+
+    def __init__(
+        self,
+        executor_type: str = "thread",
+        workers: int = 0,
+        max_queue: int = 64
+    ):
+        self.executor_type = executor_type
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._queue_wait = _TimingStat()
+        self._hash_time = _TimingStat()
+
+    @property
+    def executor(self) -> Executor:
+        # Created lazily so importing the module never forks or spawns threads
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.executor_type == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers,
+                            thread_name_prefix="password-hash"
+                        )
+        return self._executor
+
+    async def _submit(self, operation: str, func, *args):
+        if self._in_flight >= self.workers + self.max_queue:
+            self._rejected += 1
+            logger.warning("Password hashing pool saturated, rejecting request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self._in_flight += 1
+        submitted_at = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started_at, elapsed = await loop.run_in_executor(
+                self.executor, _run_timed, func, *args
+            )
+        finally:
+            self._in_flight -= 1
+
+        queue_wait = max(started_at - submitted_at, 0.0)
+        self._queue_wait.observe(queue_wait)
+        self._hash_time.observe(elapsed)
+        PASSWORD_HASH_QUEUE_WAIT.observe(queue_wait)
+        PASSWORD_HASH_DURATION.labels(operation).observe(elapsed)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Hash a plain password on the worker pool."""
+        return await self._submit("hash", security.hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a plain password against the hashed one on the worker pool."""
+        return await self._submit("verify", security.verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """Queue wait vs. hash time, for sizing PASSWORD_HASH_WORKERS"""
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "rejected": self._rejected,
+            "queue_wait": self._queue_wait.snapshot(),
+            "hash_time": self._hash_time.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHashService(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
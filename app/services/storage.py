@@ -0,0 +1,75 @@
+# app/services/storage.py
+import logging
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Protocol
+from app.core.config import settings
+from app.utils.cloudinary_utils import delete_from_cloudinary, upload_to_cloudinary
+
+logger = logging.getLogger(__name__)
+
+
+class ImageStorage(Protocol):
+    """Where avatar images live. Methods are blocking; call them from the threadpool."""
+
+    def upload(self, source: str | BinaryIO, folder: str, preprocessed: bool = False) -> str:
+        """Store the image (a file path or a binary file object) and return its public URL"""
+        ...
+
+    def delete(self, url: str) -> bool:
+        """Delete a stored image by URL; raises HTTPException on failure"""
+        ...
+
+
+class CloudinaryStorage:
+    """Cloudinary (default)"""
+
+    def upload(self, source: str | BinaryIO, folder: str, preprocessed: bool = False) -> str:
+        return upload_to_cloudinary(source, folder=folder, transform=not preprocessed)
+
+    def delete(self, url: str) -> bool:
+        return delete_from_cloudinary(url)
+
+
+class LocalFileStorage:
+    """Stores images under a local directory; stand-in for Cloudinary in tests and development"""
+
+    def __init__(self, root: str, base_url: str):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def upload(self, source: str | BinaryIO, folder: str, preprocessed: bool = False) -> str:
+        suffix = ".webp" if preprocessed else (Path(source).suffix if isinstance(source, str) else "")
+        relative = Path(folder) / f"{uuid.uuid4().hex}{suffix}"
+        target = self.root / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(source, str):
+            shutil.copyfile(source, target)
+        else:
+            with open(target, "wb") as out:
+                shutil.copyfileobj(source, out)
+        logger.info(f"Image stored locally: {relative}")
+        return f"{self.base_url}/{relative.as_posix()}"
+
+    def delete(self, url: str) -> bool:
+        if not url or not url.startswith(self.base_url + "/"):
+            return False
+        target = self.root / url[len(self.base_url) + 1:]
+        if not target.resolve().is_relative_to(self.root.resolve()):
+            return False
+        try:
+            os.unlink(target)
+        except FileNotFoundError:
+            return False
+        return True
+
+
+def build_storage() -> ImageStorage:
+    if settings.IMAGE_STORAGE_BACKEND == "local":
+        return LocalFileStorage(settings.LOCAL_STORAGE_DIR, settings.LOCAL_STORAGE_BASE_URL)
+    return CloudinaryStorage()
+
+
+image_storage: ImageStorage = build_storage()
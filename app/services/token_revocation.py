@@ -0,0 +1,242 @@
+# app/services/token_revocation.py
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.bloom import BloomFilter
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.session import session_scope
+from app.models.token import RevokedToken
+from app.utils.security import REFRESH_TOKEN_LIFETIME
+
+logger = logging.getLogger(__name__)
+
+# Re-read this far back on every sync, covering clock skew between instances
+# and revocations committed a little after their revoked_at
+SYNC_OVERLAP = timedelta(seconds=60)
+
+# Cached outcome of a table lookup for a key that is not revoked
+NOT_REVOKED = float("-inf")
+
+
+def token_keys(payload: dict) -> list[str]:
+    """
+    Denylist keys a token can be revoked by: itself, its login session, its
+    subject and the subject's token version it was issued for
+    """
+    keys = []
+    if payload.get("jti"):
+        keys.append(f"jti:{payload['jti']}")
+    if payload.get("fam"):
+        keys.append(f"fam:{payload['fam']}")
+    if payload.get("sub"):
+        keys.append(f"sub:{payload['sub']}")
+        if payload.get("tv") is not None:
+            keys.append(f"tv:{payload['sub']}:{payload['tv']}")
+    return keys
+
+
+def _timestamp(moment: datetime) -> float:
+    # SQLite hands back naive datetimes; everything stored here is UTC
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _build_filter(keys: list[str], capacity: int, error_rate: float) -> BloomFilter:
+    bloom = BloomFilter(max(capacity, 2 * len(keys)), error_rate)
+    for key in keys:
+        bloom.add(key)
+    return bloom
+
+
+class TokenRevocationStore:
+    """
+    Denylist of tokens: a bloom filter in memory, the revoked_tokens table
+    as the source of truth
+
+    A token is checked by probing the filter for its jti, family and subject,
+    which answers "not revoked" without I/O for all but revoked tokens and
+    the filter's false positives; only those are confirmed against the table
+    (and the answer cached). Revocations made by other instances arrive with
+    the periodic sync; the filter is rebuilt without expired entries on
+    compaction.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter = BloomFilter(capacity, error_rate)
+        # key -> revoked_at timestamp, or NOT_REVOKED
+        self._checked = TTLCache(max_size=10000, ttl=300)
+        self._loaded = False
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._synced_until = datetime.now(timezone.utc)
+        # Keys revoked here while a rebuild reads the table
+        self._rebuild_pending: Optional[list[str]] = None
+
+    def _record(self, key: str, revoked_at: datetime) -> None:
+        self._filter.add(key)
+        if self._rebuild_pending is not None:
+            self._rebuild_pending.append(key)
+        self._checked.set(key, _timestamp(revoked_at))
+
+    async def _ensure_loaded(self) -> None:
+        # First use, not startup, so a worker boots without the database
+        if self._loaded:
+            return
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if not self._loaded:
+                await self.rebuild()
+                self._loaded = True
+
+    async def is_revoked(self, payload: dict) -> bool:
+        """Whether a verified token's payload has been revoked"""
+        if not settings.TOKEN_REVOCATION_ENABLED:
+            return False
+        await self._ensure_loaded()
+        hits = [key for key in token_keys(payload) if key in self._filter]
+        if not hits:
+            return False
+
+        # Tokens from before `iat` was added match any revocation of their keys
+        issued_at = payload.get("iat", 0)
+        unknown = []
+        for key in hits:
+            revoked_at = self._checked.get(key)
+            if revoked_at is None:
+                unknown.append(key)
+            elif issued_at <= revoked_at:
+                return True
+        if not unknown:
+            return False
+
+        async with session_scope() as db:
+            rows = (await db.execute(
+                select(RevokedToken.key, RevokedToken.revoked_at).where(RevokedToken.key.in_(unknown))
+            )).all()
+        found = {key: _timestamp(revoked_at) for key, revoked_at in rows}
+        for key in unknown:
+            self._checked.set(key, found.get(key, NOT_REVOKED))
+        return any(issued_at <= revoked_at for revoked_at in found.values())
+
+    async def revoke(self, db: AsyncSession, key: str, expires_at: datetime) -> None:
+        """Reject tokens matching `key` issued up to now; commits `db`"""
+        if not settings.TOKEN_REVOCATION_ENABLED:
+            return
+        now = datetime.now(timezone.utc)
+        values = {"revoked_at": now, "expires_at": expires_at}
+        for attempt in range(2):
+            result = await db.execute(update(RevokedToken).where(RevokedToken.key == key).values(**values))
+            if result.rowcount == 0:
+                db.add(RevokedToken(key=key, **values))
+            try:
+                await db.commit()
+                break
+            except IntegrityError:
+                # Revoked concurrently; the update wins on the second pass
+                await db.rollback()
+                if attempt:
+                    raise
+        self._record(key, now)
+
+    async def revoke_family(self, db: AsyncSession, family: str) -> None:
+        """Log out one login session: every token refreshed from it"""
+        await self.revoke(db, f"fam:{family}", datetime.now(timezone.utc) + REFRESH_TOKEN_LIFETIME)
+
+    async def revoke_subject(self, db: AsyncSession, subject: str) -> None:
+        """Reject every token issued so far for a subject (account deletion)"""
+        await self.revoke(db, f"sub:{subject}", datetime.now(timezone.utc) + REFRESH_TOKEN_LIFETIME)
+
+    async def revoke_token_version(self, db: AsyncSession, subject: str, token_version: int) -> None:
+        """Reject tokens whose claims were issued for an outdated token_version"""
+        await self.revoke(db, f"tv:{subject}:{token_version}", datetime.now(timezone.utc) + REFRESH_TOKEN_LIFETIME)
+
+    async def consume(self, db: AsyncSession, payload: dict) -> bool:
+        """
+        Revoke a refresh token as it is exchanged; commits `db`
+
+        Returns:
+            False if it was already used (by an earlier or concurrent refresh)
+        """
+        if not settings.TOKEN_REVOCATION_ENABLED:
+            return True
+        now = datetime.now(timezone.utc)
+        key = f"jti:{payload['jti']}"
+        db.add(RevokedToken(
+            key=key, revoked_at=now, expires_at=datetime.fromtimestamp(payload["exp"], timezone.utc)
+        ))
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return False
+        self._record(key, now)
+        return True
+
+    async def sync(self) -> None:
+        """Add revocations made since the last sync (by any instance) to the filter"""
+        now = datetime.now(timezone.utc)
+        async with session_scope() as db:
+            keys = (await db.execute(
+                select(RevokedToken.key).where(
+                    RevokedToken.revoked_at > self._synced_until - SYNC_OVERLAP,
+                    RevokedToken.expires_at > now,
+                )
+            )).scalars().all()
+        for key in keys:
+            self._filter.add(key)
+            # revoked_at may have moved (re-revoked subject or family)
+            self._checked.delete(key)
+        self._synced_until = now
+
+    async def rebuild(self, purge_expired: bool = False) -> None:
+        """Replace the filter with one built from the table, optionally purging expired rows first"""
+        now = datetime.now(timezone.utc)
+        self._rebuild_pending = []
+        try:
+            async with session_scope() as db:
+                if purge_expired:
+                    await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+                    await db.commit()
+                keys = (await db.execute(
+                    select(RevokedToken.key).where(RevokedToken.expires_at > now)
+                )).scalars().all()
+            bloom = await run_in_threadpool(_build_filter, keys, self.capacity, self.error_rate)
+            for key in self._rebuild_pending:
+                bloom.add(key)
+            self._filter = bloom
+            self._synced_until = now
+        finally:
+            self._rebuild_pending = None
+        logger.info(f"Token revocation filter rebuilt with {len(keys)} entries")
+
+    async def run_maintenance(self) -> None:
+        """Sync and periodically compact until cancelled (started by the app lifespan)"""
+        compacted_at = time.monotonic()
+        while True:
+            await asyncio.sleep(settings.TOKEN_REVOCATION_SYNC_SECONDS)
+            # Nothing to keep current until the first token check loaded it
+            if not self._loaded:
+                continue
+            try:
+                if time.monotonic() - compacted_at >= settings.TOKEN_REVOCATION_COMPACT_SECONDS:
+                    await self.rebuild(purge_expired=True)
+                    compacted_at = time.monotonic()
+                else:
+                    await self.sync()
+            except Exception as e:
+                logger.warning(f"Token revocation sync failed: {str(e)}")
+
+
+token_revocations = TokenRevocationStore(
+    settings.TOKEN_REVOCATION_CAPACITY, settings.TOKEN_REVOCATION_ERROR_RATE
+)
@@ -0,0 +1,70 @@
+# app/services/user_cache.py
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.cache import build_cache_backend
+from app.core.config import settings
+from app.models.user import User, UserRole
+from app.services.auth_service import Identity
+
+# Columns needed to rebuild the authenticated user; the password hash is
+# deliberately never cached.
+CACHED_COLUMNS = (
+    "id", "role", "email", "username", "is_active",
+    "first_name", "last_name", "phone_number", "avatar_url", "version", "token_version",
+)
+
+user_cache = build_cache_backend(
+    settings.USER_CACHE_BACKEND,
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    prefix="user:",
+)
+
+
+def _to_cache(user: User) -> dict:
+    data = {column: getattr(user, column) for column in CACHED_COLUMNS}
+    data["role"] = user.role.value if user.role is not None else None
+    return data
+
+
+def _from_cache(data: dict) -> User:
+    data = dict(data)
+    data["role"] = UserRole(data["role"]) if data["role"] is not None else None
+    user = User(**data)
+    # Mark as an existing row so the session can update/delete it without a SELECT
+    make_transient_to_detached(user)
+    return user
+
+
+async def get_cached_user(db: AsyncSession, email: str) -> User | None:
+    """
+    Return the user for a token subject from the identity cache
+
+    On a hit the user is attached to `db` without a query, so endpoints can
+    still modify or delete it as usual.
+    """
+    data = await user_cache.get(email)
+    # Entries written before a column was added to CACHED_COLUMNS are misses
+    if data is None or not all(column in data for column in CACHED_COLUMNS):
+        return None
+    user = _from_cache(data)
+    db.add(user)
+    return user
+
+
+async def get_cached_identity(email: str) -> Identity | None:
+    """Like get_cached_user, but without building or attaching a User"""
+    data = await user_cache.get(email)
+    if data is None or not all(column in data for column in CACHED_COLUMNS):
+        return None
+    role = UserRole(data["role"]) if data["role"] is not None else None
+    return Identity(data["id"], data["email"], role, data["is_active"], data["token_version"])
+
+
+async def cache_user(user: User) -> None:
+    await user_cache.set(user.email, _to_cache(user))
+
+
+async def invalidate_user(email: str) -> None:
+    """Drop a user from the identity cache; call after every profile write"""
+    await user_cache.delete(email)
@@ -1,19 +1,144 @@
+import csv
+import io
+import json
+from typing import AsyncIterator
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import session_scope
 from app.models.user import User
-from app.schemas.user import UserCreate
-from app.db.session import SessionLocal
-from app.utils.security import hash_password
+from app.schemas.user import UserAccessUpdate, UserCreate
+from app.services.password_service import password_hasher
+from app.services.token_revocation import token_revocations
+from app.services.user_cache import invalidate_user
 
-def get_user_by_email(db: SessionLocal, email: str):
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
-def create_user(db: SessionLocal, user: UserCreate):
+async def create_user(db: AsyncSession, user: UserCreate):
     db_user = User(
         email=user.email,
-        password=hash_password(user.password),
+        password=await password_hasher.hash(user.password),
         first_name=user.first_name,
         username=user.username
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
\ No newline at end of file
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def update_user_access(db: AsyncSession, user_id: int, data: UserAccessUpdate):
+    """
+    Change a user's role and/or active flag
+
+    Bumps token_version and revokes tokens issued for the previous one, so
+    claims-only authorization never acts on the old role. One UPDATE ...
+    RETURNING with token_version + 1: concurrent changes serialize on the
+    row lock and each revokes the version it replaced, instead of the
+    loser failing the ORM's version check.
+    """
+    user = (await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            **data.model_dump(exclude_unset=True),
+            token_version=User.token_version + 1,
+            # Keeps the version_id_col (profile ETags) moving, as an ORM update would
+            version=User.version + 1,
+        )
+        .returning(User.id, User.email, User.role, User.is_active, User.token_version)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    await db.commit()
+    await invalidate_user(user.email)
+    await token_revocations.revoke_token_version(db, user.email, user.token_version - 1)
+    return user
+
+# Columns callers may request through `fields`; the password hash is never listed
+USER_LIST_FIELDS = (
+    "id", "username", "email", "role", "is_active",
+    "first_name", "last_name", "phone_number", "avatar_url",
+)
+
+def parse_user_fields(value: str | None, default: list[str]) -> list[str]:
+    """Parse a comma-separated `fields` parameter; 400 on unknown columns"""
+    fields = [part.strip() for part in value.split(",") if part.strip()] if value else []
+    fields = fields or default
+    unknown = set(fields) - set(USER_LIST_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields
+
+def _columns(fields: list[str]):
+    # id always comes back: it is the pagination cursor and the batch key
+    return [User.id] + [getattr(User, field) for field in fields if field != "id"]
+
+def _row_to_dict(row) -> dict:
+    data = dict(row._mapping)
+    if data.get("role") is not None:
+        data["role"] = data["role"].value
+    return data
+
+async def get_users_by_ids(db: AsyncSession, ids: list[int], fields: list[str]) -> list[dict]:
+    """Resolve many users with a single IN query, in the order of `ids`"""
+    result = await db.execute(select(*_columns(fields)).where(User.id.in_(ids)))
+    rows = {row.id: _row_to_dict(row) for row in result}
+    return [rows[user_id] for user_id in ids if user_id in rows]
+
+async def list_users(
+    db: AsyncSession,
+    fields: list[str],
+    after_id: int | None = None,
+    limit: int = 50,
+    role: str | None = None,
+    is_active: bool | None = None
+) -> tuple[list[dict], int | None]:
+    """
+    One page of users ordered by id, using keyset pagination
+
+    Seeks past `after_id` on an index instead of OFFSET-scanning, so deep
+    pages cost the same as the first one.
+
+    Returns:
+        (items, next_cursor); next_cursor is None on the last page
+    """
+    stmt = select(*_columns(fields)).order_by(User.id).limit(limit + 1)
+    if after_id is not None:
+        stmt = stmt.where(User.id > after_id)
+    if role is not None:
+        stmt = stmt.where(User.role == role)
+    if is_active is not None:
+        stmt = stmt.where(User.is_active == is_active)
+
+    items = [_row_to_dict(row) for row in await db.execute(stmt)]
+    if len(items) > limit:
+        items = items[:limit]
+        return items, items[-1]["id"]
+    return items, None
+
+async def iter_user_export(fields: list[str], fmt: str = "jsonl", batch_size: int = 1000) -> AsyncIterator[str]:
+    """
+    Stream all users as JSON lines or CSV from a server-side cursor
+
+    Rows are fetched `batch_size` at a time and each batch is yielded as one
+    chunk, so memory stays flat however many users there are. Opens its own
+    read session because it outlives the request's dependencies.
+    """
+    columns = _columns(fields)
+    stmt = select(*columns).order_by(User.id).execution_options(yield_per=batch_size)
+    async with session_scope(read_only=True) as db:
+        result = await db.stream(stmt)
+        if fmt == "csv":
+            yield ",".join(column.key for column in columns) + "\r\n"
+        async for rows in result.partitions():
+            buffer = io.StringIO()
+            if fmt == "csv":
+                writer = csv.writer(buffer)
+                writer.writerows(_row_to_dict(row).values() for row in rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(_row_to_dict(row)) + "\n")
+            yield buffer.getvalue()
@@ -1,41 +1,54 @@
 # app/utils/cloudinary_utils.py
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
+from functools import lru_cache
 from fastapi import HTTPException, status
 from urllib.parse import urlparse
 from app.core.config import settings
+from app.core.metrics import CLOUDINARY_DURATION, CLOUDINARY_ERRORS, timed
 import logging
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
-# Initialize Cloudinary
-cloudinary.config(
-    cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-    api_key=settings.CLOUDINARY_API_KEY,
-    api_secret=settings.CLOUDINARY_API_SECRET
-)
+@lru_cache(maxsize=None)
+def get_uploader():
+    """
+    Configure Cloudinary on first use and return its uploader module
+
+    Deferred so importing the app (every worker boot) doesn't load the SDK.
+    """
+    import cloudinary
+    import cloudinary.uploader
+
+    cloudinary.config(
+        cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+        api_key=settings.CLOUDINARY_API_KEY,
+        api_secret=settings.CLOUDINARY_API_SECRET
+    )
+    return cloudinary.uploader
 
 def upload_to_cloudinary(
-    file_content: bytes,
+    file_content: Union[bytes, str, BinaryIO],
     folder: str = "avatars",
     public_id: Optional[str] = None,
     width: int = 250,
     height: int = 250,
-    crop: str = "fill"
+    crop: str = "fill",
+    transform: bool = True
 ) -> str:
     """
     Uploads an image to Cloudinary with automatic resizing
     
     Args:
-        file_content: Binary content of the image
+        file_content: Binary content of the image, a local file path or
+            a binary file object
         folder: Cloudinary folder to store the image
         public_id: Optional custom public ID
         width: Target width in pixels
         height: Target height in pixels
         crop: Cloudinary crop mode ('fill', 'fit', etc.)
+        transform: Let Cloudinary resize/re-encode; pass False for images
+            already preprocessed locally to skip the transformation quota
     
     Returns:
         str: Secure URL of the uploaded image
@@ -44,19 +57,21 @@ def upload_to_cloudinary(
         HTTPException: If upload fails
     """
     try:
-        result = cloudinary.uploader.upload(
-            file_content,
-            folder=folder,
-            public_id=public_id,
-            width=width,
-            height=height,
-            crop=crop,
-            quality="auto",
-            format="webp"  # Modern format for better compression
-        )
+        options = {"folder": folder, "public_id": public_id}
+        if transform:
+            options.update(
+                width=width,
+                height=height,
+                crop=crop,
+                quality="auto",
+                format="webp"  # Modern format for better compression
+            )
+        with timed(CLOUDINARY_DURATION.labels("upload")):
+            result = get_uploader().upload(file_content, **options)
         logger.info(f"Image uploaded to Cloudinary: {result['public_id']}")
         return result["secure_url"]
     except Exception as e:
+        CLOUDINARY_ERRORS.labels("upload").inc()
         logger.error(f"Cloudinary upload failed: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -84,13 +99,15 @@ def delete_from_cloudinary(url: str) -> bool:
         if not public_id:
             return False
             
-        result = cloudinary.uploader.destroy(public_id)
+        with timed(CLOUDINARY_DURATION.labels("destroy")):
+            result = get_uploader().destroy(public_id)
         if result.get("result") == "ok":
             logger.info(f"Deleted Cloudinary image: {public_id}")
             return True
         else:
             raise Exception(f"Cloudinary deletion failed: {result}")
     except Exception as e:
+        CLOUDINARY_ERRORS.labels("destroy").inc()
         logger.error(f"Cloudinary deletion error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -1,11 +1,28 @@
+import hashlib
+import time
+import uuid
 from fastapi import HTTPException
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
-from jose import JWTError, jwt
+from jose import JWTError, jwt as jose_jwt
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def build_password_context() -> CryptContext:
+    """Build the CryptContext from the configured hashing policy"""
+    schemes = [s.strip() for s in settings.PASSWORD_HASH_SCHEMES.split(",") if s.strip()]
+    options = {"bcrypt__rounds": settings.BCRYPT_ROUNDS}
+    if "argon2" in schemes:
+        # Requires argon2-cffi
+        options.update(
+            argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+            argon2__time_cost=settings.ARGON2_TIME_COST,
+            argon2__parallelism=settings.ARGON2_PARALLELISM,
+        )
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
+pwd_context = build_password_context()
 
 def hash_password(password: str) -> str:
     """Hash a plain password."""
@@ -15,24 +32,83 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against the hashed one."""
     return pwd_context.verify(plain_password, hashed_password)
 
+def password_needs_update(hashed_password: str) -> bool:
+    """True if the hash uses a deprecated scheme or different cost settings."""
+    return pwd_context.needs_update(hashed_password)
+
+class JoseJWTBackend:
+    """python-jose (default)"""
+
+    def encode(self, claims: dict, key: str, algorithm: str) -> str:
+        return jose_jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict:
+        return jose_jwt.decode(token, key, algorithms=algorithms)
+
+
+class PyJWTBackend:
+    """PyJWT; its errors are re-raised as JWTError"""
+
+    def __init__(self):
+        import jwt as pyjwt  # optional dependency
+        self._jwt = pyjwt
+
+    def encode(self, claims: dict, key: str, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._jwt.PyJWTError as e:
+            raise JWTError(str(e))
+
+
+JWT_BACKENDS = {"jose": JoseJWTBackend, "pyjwt": PyJWTBackend}
+
+jwt = JWT_BACKENDS[settings.JWT_BACKEND]()
+
+# token digest -> verified payload, each entry expiring with the token's exp
+_verified_tokens = TTLCache(max_size=settings.TOKEN_CACHE_MAX_SIZE)
+
+ACCESS_TOKEN_LIFETIME = timedelta(minutes=15)
+REFRESH_TOKEN_LIFETIME = timedelta(days=7)
+
 def create_tokens(
     data: dict,
     access_expires: timedelta = None,
-    refresh_expires: timedelta = None
+    refresh_expires: timedelta = None,
+    family: str = None
 ) -> dict:
-    """Generate both access and refresh tokens"""
-    access_expires = access_expires or timedelta(minutes=15)
-    refresh_expires = refresh_expires or timedelta(days=7)
+    """
+    Generate both access and refresh tokens
+
+    Each token gets its own `jti`; both share `fam`, the login session they
+    belong to, which a refresh keeps by passing the old token's family.
+    """
+    access_expires = access_expires or ACCESS_TOKEN_LIFETIME
+    refresh_expires = refresh_expires or REFRESH_TOKEN_LIFETIME
+    now = datetime.now(timezone.utc)
+    family = family or uuid.uuid4().hex
+    # Fractional, unlike exp: revocations compare against it, and a
+    # whole-second iat would count a token minted just after a revocation
+    # (in the same second) as revoked
+    issued_at = now.timestamp()
     
     access_data = data.copy()
     access_data.update({
-        "exp": datetime.now(timezone.utc) + access_expires,
+        "exp": now + access_expires,
+        "iat": issued_at,
+        "jti": uuid.uuid4().hex,
+        "fam": family,
         "refresh": False
     })
     
     refresh_data = data.copy()
     refresh_data.update({
-        "exp": datetime.now(timezone.utc) + refresh_expires,
+        "exp": now + refresh_expires,
+        "iat": issued_at,
+        "jti": uuid.uuid4().hex,
+        "fam": family,
         "refresh": True
     })
     
@@ -51,17 +127,32 @@ def create_tokens(
     }
 
 def verify_token(token: str) -> dict:
+    """
+    Decode and verify a JWT, reusing earlier verifications of the same token
+
+    Clients send the same access token many times, so verified payloads are
+    cached by token digest until the token's own `exp`. The JWT backend
+    already rejects expired tokens on decode.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = _verified_tokens.get(digest)
+    if payload is not None:
+        return dict(payload)
+
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        if datetime.now(timezone.utc) > datetime.fromtimestamp(payload["exp"], tz=timezone.utc):
-            raise JWTError("Token expired")
-        return payload
     except JWTError as e:
         raise HTTPException(
             status_code=401,
             detail=f"Invalid token: {str(e)}"
         )
+
+    if settings.TOKEN_CACHE_MAX_SIZE > 0 and "exp" in payload:
+        ttl = payload["exp"] - time.time()
+        if ttl > 0:
+            _verified_tokens.set(digest, payload, ttl)
+    return dict(payload)
@@ -0,0 +1,68 @@
+# benchmarks/bench_avatar_pipeline.py
+"""
+Bytes on the wire and end-to-end avatar latency, raw upload vs. local
+preprocessing, against the local-filesystem storage backend.
+
+The network leg is simulated from --mbps so results don't depend on
+Cloudinary. Requires Pillow.
+
+    python -m benchmarks.bench_avatar_pipeline [--width 4000 --height 3000 --mbps 20]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from benchmarks.common import bootstrap_env
+
+bootstrap_env()
+
+from app.services.image_service import preprocess_image  # noqa: E402
+from app.services.storage import LocalFileStorage  # noqa: E402
+
+
+def make_photo(width: int, height: int) -> str:
+    """A noisy JPEG roughly the size of a phone photo"""
+    from PIL import Image
+
+    image = Image.frombytes("RGB", (width, height), random.randbytes(width * height * 3))
+    fd, path = tempfile.mkstemp(suffix=".jpg")
+    with os.fdopen(fd, "wb") as out:
+        image.save(out, format="JPEG", quality=90)
+    return path
+
+
+def run(storage: LocalFileStorage, path: str, preprocess: bool, mbps: float) -> dict:
+    start = time.perf_counter()
+    upload_path = preprocess_image(path) if preprocess else path
+    cpu_seconds = time.perf_counter() - start
+    size = os.path.getsize(upload_path)
+    storage.upload(upload_path, "bench", preprocessed=preprocess)
+    if preprocess:
+        os.unlink(upload_path)
+    network_seconds = size * 8 / (mbps * 1_000_000)
+    return {
+        "bytes": size,
+        "preprocess_ms": round(cpu_seconds * 1000, 1),
+        "network_ms": round(network_seconds * 1000, 1),
+        "total_ms": round((time.perf_counter() - start + network_seconds) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--mbps", type=float, default=20.0, help="simulated uplink bandwidth")
+    args = parser.parse_args()
+
+    path = make_photo(args.width, args.height)
+    with tempfile.TemporaryDirectory() as root:
+        storage = LocalFileStorage(root, "http://bench.local/media")
+        for label, preprocess in (("raw", False), ("preprocessed", True)):
+            print(f"{label:>13}: {run(storage, path, preprocess, args.mbps)}")
+    os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
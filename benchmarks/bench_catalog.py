@@ -0,0 +1,106 @@
+# benchmarks/bench_catalog.py
+"""
+Catalog listing/search latency against a real PostgreSQL catalog.
+
+Seeds --products synthetic SKUs server-side (generate_series) into the
+database from the DB_* settings, which must already be migrated
+(`alembic upgrade head`), then times first/deep keyset pages, cached
+category pages and searches through catalog_service.
+
+    python -m benchmarks.bench_catalog --products 1000000 [--seed] [--rounds 50]
+"""
+import argparse
+import asyncio
+import json
+import time
+from benchmarks.common import bootstrap_env, summarize
+
+bootstrap_env()
+
+from sqlalchemy import func, select, text  # noqa: E402
+from app.db.session import AsyncSessionLocal, dispose_engines  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.services import catalog_service  # noqa: E402
+
+SEED_SQL = """
+INSERT INTO categories (name, slug)
+SELECT 'Category ' || n, 'bench-category-' || n FROM generate_series(1, :categories) AS n
+ON CONFLICT (slug) DO NOTHING;
+
+INSERT INTO users (email, username, password, role, is_active)
+VALUES ('bench-seller@example.com', 'bench-seller', 'x', 'SELLER', true)
+ON CONFLICT DO NOTHING;
+
+INSERT INTO products (seller_id, category_id, sku, name, description, price)
+SELECT
+    (SELECT id FROM users WHERE email = 'bench-seller@example.com'),
+    (SELECT min(id) FROM categories WHERE slug LIKE 'bench-category-%') + n % :categories,
+    'BENCH-' || n,
+    (ARRAY['red', 'blue', 'green', 'black', 'white'])[1 + n % 5] || ' '
+        || (ARRAY['running shoe', 'jacket', 'backpack', 'watch', 'lamp'])[1 + n % 7 % 5] || ' ' || n,
+    'Synthetic product number ' || n,
+    (n % 10000) / 100.0 + 1
+FROM generate_series(1, :products) AS n
+ON CONFLICT (sku) DO NOTHING;
+
+ANALYZE products;
+"""
+
+
+async def seed(products: int, categories: int) -> None:
+    async with AsyncSessionLocal() as db:
+        for statement in filter(str.strip, SEED_SQL.split(";")):
+            await db.execute(text(statement), {"products": products, "categories": categories})
+        await db.commit()
+
+
+async def timed(rounds: int, call) -> dict:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=200)
+    parser.add_argument("--seed", action="store_true", help="insert the synthetic catalog first")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    if AsyncSessionLocal is None:
+        raise SystemExit("Set DB_ASYNC=true for this benchmark")
+    if args.seed:
+        start = time.perf_counter()
+        await seed(args.products, args.categories)
+        print(f"seeded in {time.perf_counter() - start:.1f}s")
+
+    async with AsyncSessionLocal() as db:
+        category_id = await db.scalar(select(func.min(Product.category_id)))
+        max_id = await db.scalar(select(func.max(Product.id)))
+
+        async def uncached(**kwargs):
+            await catalog_service._query_products(
+                db, kwargs.get("category_id"), None, kwargs.get("q"), kwargs.get("after_id"), 50
+            )
+
+        results = {
+            "category_first_page": await timed(args.rounds, lambda: uncached(category_id=category_id)),
+            "category_deep_page": await timed(
+                args.rounds, lambda: uncached(category_id=category_id, after_id=int(max_id * 0.9))
+            ),
+            "category_page_cached": await timed(
+                args.rounds, lambda: catalog_service.list_products(db, category_id=category_id)
+            ),
+            "search_fulltext": await timed(args.rounds, lambda: uncached(q="running shoe")),
+            "search_substring": await timed(args.rounds, lambda: uncached(q="ackpa")),
+        }
+    print(json.dumps(results, indent=2))
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
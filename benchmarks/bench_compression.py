@@ -0,0 +1,146 @@
+# benchmarks/bench_compression.py
+"""
+Response compression: CPU cost vs. bytes saved per coding and level.
+
+Compresses payloads shaped like the API's responses (a users listing, a
+products listing, the NDJSON user export) with every available coding
+(br and zstd only if brotli / zstandard are installed) at a range of levels,
+and reports compressed size, ratio, CPU time per MB and how many bytes each
+millisecond of CPU saves. Then pushes the export through CompressionMiddleware
+in 64 KiB chunks, as StreamingResponse sends it, to show the streaming
+overhead against one-shot compression of the same body.
+
+    python -m benchmarks.bench_compression [--rows 1000] [--number 20] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from benchmarks.common import bootstrap_env, time_per_call
+
+bootstrap_env()
+
+from app.core.compression import ENCODERS, CompressionMiddleware, available_encodings  # noqa: E402
+
+LEVELS = {
+    "gzip": [1, 4, 6, 9],
+    "br": [1, 4, 6, 9, 11],
+    "zstd": [1, 3, 6, 9, 19],
+}
+STREAM_CHUNK = 64 * 1024
+
+
+def user_rows(count: int) -> list[dict]:
+    rng = random.Random(42)
+    return [
+        {
+            "id": n, "email": f"user{n}@example.com", "username": f"user{n}",
+            "first_name": rng.choice(["Ada", "Linus", "Grace", "Alan", "Barbara"]),
+            "last_name": rng.choice(["Lovelace", "Torvalds", "Hopper", "Turing", "Liskov"]),
+            "role": rng.choice(["user", "user", "user", "admin"]), "is_active": rng.random() > 0.05,
+            "profile_image": f"https://res.cloudinary.com/demo/image/upload/v1/avatars/{n}.webp",
+            "created_at": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00Z",
+        }
+        for n in range(count)
+    ]
+
+
+def product_rows(count: int) -> list[dict]:
+    rng = random.Random(7)
+    words = ["wireless", "organic", "compact", "premium", "steel", "cotton", "portable", "smart"]
+    return [
+        {
+            "id": n, "name": " ".join(rng.sample(words, 3)).title(),
+            "description": " ".join(rng.choices(words, k=30)),
+            "price": round(rng.uniform(1, 500), 2), "stock": rng.randint(0, 1000),
+            "category_id": rng.randint(1, 20), "image_url": f"https://cdn.example.com/p/{n}.jpg",
+        }
+        for n in range(count)
+    ]
+
+
+def payloads(rows: int) -> dict[str, bytes]:
+    users = user_rows(rows)
+    return {
+        "users JSON": json.dumps(users).encode(),
+        "products JSON": json.dumps(product_rows(rows)).encode(),
+        "export NDJSON": "".join(json.dumps(u) + "\n" for u in users).encode(),
+    }
+
+
+def one_shot(encoding: str, level: int, body: bytes) -> bytes:
+    encoder = ENCODERS[encoding](level)
+    return encoder.compress(body) + encoder.flush()
+
+
+async def through_middleware(body: bytes, chunk_size: int, accept: str) -> int:
+    """Send `body` through the middleware in chunks; returns bytes on the wire"""
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start", "status": 200,
+            "headers": [(b"content-type", b"application/x-ndjson")],
+        })
+        for offset in range(0, len(body), chunk_size):
+            await send({
+                "type": "http.response.body", "body": body[offset:offset + chunk_size],
+                "more_body": offset + chunk_size < len(body),
+            })
+
+    sent = 0
+
+    async def send(message):
+        nonlocal sent
+        sent += len(message.get("body", b""))
+
+    scope = {"type": "http", "method": "GET", "headers": [(b"accept-encoding", accept.encode())]}
+    await CompressionMiddleware(app)(scope, None, send)
+    return sent
+
+
+async def time_middleware(body: bytes, chunk_size: int, accept: str, number: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(number):
+        sent = await through_middleware(body, chunk_size, accept)
+    return (time.perf_counter() - start) / number, sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    encodings = available_encodings(["gzip", "br", "zstd"])
+    missing = sorted(set(ENCODERS) - set(encodings))
+    if missing:
+        print(f"skipping {', '.join(missing)} (package not installed)")
+
+    bodies = payloads(args.rows)
+    for name, body in bodies.items():
+        print(f"\n{name}: {len(body) / 1024:.1f} KiB")
+        print(f"{'coding':>6} {'level':>5} {'size KiB':>9} {'ratio':>6} {'ms/MB':>8} {'KiB saved/ms':>13}")
+        for encoding in encodings:
+            for level in LEVELS[encoding]:
+                size = len(one_shot(encoding, level, body))
+                seconds = time_per_call(
+                    lambda: one_shot(encoding, level, body), number=args.number, repeat=args.repeat
+                )
+                ms = seconds * 1000
+                print(
+                    f"{encoding:>6} {level:>5} {size / 1024:>9.1f} {len(body) / size:>6.1f} "
+                    f"{ms / (len(body) / 1e6):>8.2f} {(len(body) - size) / 1024 / ms:>13.1f}"
+                )
+
+    body = bodies["export NDJSON"]
+    print(f"\nexport through CompressionMiddleware ({STREAM_CHUNK // 1024} KiB chunks vs. one body)")
+    for encoding in encodings:
+        for label, chunk_size in (("streamed", STREAM_CHUNK), ("one-shot", len(body))):
+            seconds, sent = asyncio.run(time_middleware(body, chunk_size, encoding, args.number))
+            ms = seconds * 1000
+            print(f"{encoding:>6} {label:>9}: {ms:7.2f} ms  {sent / 1024:8.1f} KiB on the wire")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_logging.py
+"""
+Cost of one logger.info on the request path: handlers called inline (the old
+RotatingFileHandler + console setup) vs. the QueueHandler pipeline, where
+formatting and file I/O happen on the listener thread.
+
+    python -m benchmarks.bench_logging [--number 20000]
+"""
+import argparse
+import logging
+import os
+import queue
+import tempfile
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+from benchmarks.common import bootstrap_env
+
+bootstrap_env()
+
+from app.core.logger import (  # noqa: E402
+    JsonFormatter, NonBlockingQueueHandler, RequestContextFilter, TEXT_FORMAT, request_id_var
+)
+
+
+def output_handlers(directory: str, formatter: logging.Formatter) -> list[logging.Handler]:
+    file_handler = RotatingFileHandler(
+        os.path.join(directory, "app.log"), maxBytes=1024 * 1024 * 5, backupCount=3, encoding="utf-8"
+    )
+    console = logging.StreamHandler(open(os.devnull, "w"))
+    for handler in (file_handler, console):
+        handler.setFormatter(formatter)
+    return [file_handler, console]
+
+
+def per_call(logger: logging.Logger, number: int) -> float:
+    start = time.perf_counter()
+    for i in range(number):
+        logger.info("Image uploaded to Cloudinary: %s", f"avatars/user_{i}")
+    return (time.perf_counter() - start) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+    request_id_var.set("bench-request")
+    results = {}
+
+    for label, formatter in (("text", logging.Formatter(TEXT_FORMAT)), ("json", JsonFormatter())):
+        with tempfile.TemporaryDirectory() as directory:
+            logger = logging.getLogger(f"bench.inline.{label}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            for handler in output_handlers(directory, formatter):
+                handler.addFilter(RequestContextFilter())
+                logger.addHandler(handler)
+            results[f"inline handlers ({label})"] = per_call(logger, args.number)
+
+        with tempfile.TemporaryDirectory() as directory:
+            log_queue = queue.Queue(maxsize=args.number * 2)
+            queue_handler = NonBlockingQueueHandler(log_queue)
+            queue_handler.addFilter(RequestContextFilter())
+            logger = logging.getLogger(f"bench.queue.{label}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            logger.addHandler(queue_handler)
+            listener = QueueListener(log_queue, *output_handlers(directory, formatter))
+            listener.start()
+            results[f"queue handler ({label})"] = per_call(logger, args.number)
+            start = time.perf_counter()
+            listener.stop()
+            drain = time.perf_counter() - start
+            print(f"queue ({label}): listener drained the backlog in {drain * 1000:.0f} ms, "
+                  f"{queue_handler.dropped} dropped")
+
+    for name, seconds in results.items():
+        print(f"{name:>24}: {seconds * 1e6:8.2f} us/call on the caller's thread")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_login_lookup.py
+"""
+Login lookup: full User hydration vs. the projected credentials row.
+
+Times get_user_by_email (ORM entity) against get_credentials_by_email
+(plain tuple of the login columns) over --users accounts, each lookup in
+a fresh session as in a request. Uses the DB_* database (migrated; --seed
+inserts the accounts) or a throwaway SQLite file with --sqlite. On PostgreSQL
+the plan of the projected query is printed too; it should be an Index Only
+Scan on ix_users_email_login.
+
+    python -m benchmarks.bench_login_lookup --sqlite /tmp/login.db [--users 10000] [--rounds 5000]
+    python -m benchmarks.bench_login_lookup --seed --users 100000
+"""
+import argparse
+import asyncio
+import os
+import time
+from benchmarks.common import bootstrap_env, summarize
+
+bootstrap_env(DB_ASYNC="true")
+
+from sqlalchemy import insert, select, text  # noqa: E402
+from app.db.session import Base, configure_engines, dispose_engines, get_engines  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.services.auth_service import CREDENTIAL_COLUMNS, get_credentials_by_email, get_user_by_email  # noqa: E402
+
+# Realistic bcrypt-sized hash; the value itself is never verified here
+PASSWORD_HASH = "$2b$12$" + "x" * 53
+
+
+def email_for(n: int) -> str:
+    return f"bench-login-{n}@example.com"
+
+
+async def seed(users: int) -> None:
+    async with get_engines().AsyncSessionLocal() as db:
+        await db.execute(insert(User), [
+            {
+                "email": email_for(n), "username": f"bench-login-{n}", "password": PASSWORD_HASH,
+                "role": UserRole.USER, "is_active": True, "first_name": "Bench", "last_name": str(n),
+            }
+            for n in range(users)
+        ])
+        await db.commit()
+
+
+async def timed(rounds: int, users: int, lookup) -> dict:
+    factory = get_engines().AsyncSessionLocal
+    samples = []
+    for i in range(rounds):
+        email = email_for(i * 7919 % users)
+        start = time.perf_counter()
+        async with factory() as db:
+            assert await lookup(db, email) is not None
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5000)
+    parser.add_argument("--sqlite", metavar="PATH", help="Use a fresh SQLite file instead of the DB_* database")
+    parser.add_argument("--seed", action="store_true", help="insert the accounts first (implied by --sqlite)")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        if os.path.exists(args.sqlite):
+            os.remove(args.sqlite)
+        Base.metadata.create_all(configure_engines(
+            f"sqlite:///{args.sqlite}", f"sqlite+aiosqlite:///{args.sqlite}"
+        ).engine)
+    if args.seed or args.sqlite:
+        await seed(args.users)
+
+    results = {}
+    # Warm both paths (connections, statement caches) before measuring
+    await timed(200, args.users, get_user_by_email)
+    await timed(200, args.users, get_credentials_by_email)
+    results["User entity"] = await timed(args.rounds, args.users, get_user_by_email)
+    results["credentials row"] = await timed(args.rounds, args.users, get_credentials_by_email)
+
+    for name, summary in results.items():
+        print(
+            f"{name:>16}: mean {summary['mean_ms'] * 1000:8.1f} us  p50 {summary['p50_ms'] * 1000:8.1f} us  "
+            f"p99 {summary['p99_ms'] * 1000:8.1f} us"
+        )
+    saved = 1 - results["credentials row"]["mean_ms"] / results["User entity"]["mean_ms"]
+    print(f"projection saves {saved:.1%} per login lookup")
+
+    if not args.sqlite:
+        statement = select(*CREDENTIAL_COLUMNS).where(User.email == email_for(0))
+        compiled = statement.compile(get_engines().engine, compile_kwargs={"literal_binds": True})
+        async with get_engines().AsyncSessionLocal() as db:
+            plan = await db.execute(text(f"EXPLAIN ANALYZE {compiled}"))
+            print("\n".join(row[0] for row in plan))
+
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
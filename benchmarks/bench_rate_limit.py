@@ -0,0 +1,62 @@
+# benchmarks/bench_rate_limit.py
+"""
+Per-check overhead of the auth rate limiter, single-threaded and with
+threads hitting the sharded memory store at once.
+
+    python -m benchmarks.bench_rate_limit [--number 200000] [--keys 10000]
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.common import bootstrap_env, time_per_call
+
+bootstrap_env()
+
+from app.core.rate_limit import MemoryRateLimitStore, enforce_rate_limit  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200000)
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    keys = [f"ip:/auth/login:10.0.{i // 256}.{i % 256}" for i in range(args.keys)]
+    results = {}
+
+    for shards in (1, 16):
+        store = MemoryRateLimitStore(shards=shards)
+        counter = iter(range(10 ** 12))
+        results[f"take ({shards} shard{'s' if shards > 1 else ''})"] = time_per_call(
+            lambda: store.take(keys[next(counter) % len(keys)], 1000, 1000.0), args.number
+        )
+
+        def worker(offset: int) -> None:
+            for i in range(args.number // args.threads):
+                store.take(keys[(i + offset) % len(keys)], 1000, 1000.0)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(worker, range(0, args.threads * 997, 997)))
+        results[f"take x{args.threads} threads ({shards} shard{'s' if shards > 1 else ''})"] = (
+            (time.perf_counter() - start) / args.number
+        )
+
+    store = MemoryRateLimitStore()
+
+    async def checks():
+        start = time.perf_counter()
+        for i in range(args.number):
+            await enforce_rate_limit(keys[i % len(keys)], 1000, 60000, store=store)
+        return (time.perf_counter() - start) / args.number
+
+    results["enforce_rate_limit (async)"] = asyncio.run(checks())
+
+    for name, seconds in results.items():
+        print(f"{name:>32}: {seconds * 1e6:9.2f} us/check")
+
+
+if __name__ == "__main__":
+    main()
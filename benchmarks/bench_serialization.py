@@ -0,0 +1,127 @@
+# benchmarks/bench_serialization.py
+"""
+Serialization cost per hot route: FastAPI's default response_model path,
+an orjson default_response_class, and model_response (FAST_JSON=true).
+
+Each variant is a bare FastAPI app whose route returns an in-memory ORM-like
+user, called directly over ASGI so only routing + serialization is measured.
+
+    python -m benchmarks.bench_serialization [--number 5000]
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from benchmarks.common import bootstrap_env
+
+bootstrap_env()
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from app.core import responses  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.schemas.auth import AuthResponse  # noqa: E402
+from app.schemas.profile import ProfileResponse  # noqa: E402
+from app.schemas.user import UserOut  # noqa: E402
+
+USER = SimpleNamespace(
+    id=42, email="bench@example.com", username="bench", role="user", is_active=True,
+    first_name="Bench", last_name="Mark", phone_number="+1234567890",
+    avatar_url="https://res.cloudinary.com/demo/image/upload/v1/users/42/avatars/a.webp",
+)
+LOGIN = {
+    "access_token": "a" * 180, "refresh_token": "r" * 180, "token_type": "bearer",
+    "email": USER.email, "role": USER.role, "expires_at": datetime.utcnow() + timedelta(minutes=15),
+}
+ROUTES = {
+    "/users/me": (ProfileResponse, lambda: USER),
+    "/users/{user_id}": (UserOut, lambda: USER),
+    "/auth/login": (AuthResponse, lambda: dict(LOGIN)),
+}
+
+
+def make_endpoint(schema, source, fast: bool):
+    # Closures, not default arguments: FastAPI would treat those as query params
+    if fast:
+        async def endpoint():
+            return responses.model_response(schema, source())
+    else:
+        async def endpoint():
+            return source()
+    return endpoint
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI(default_response_class=responses.FastJSONResponse) if variant == "orjson default" else FastAPI()
+    for path, (schema, source) in ROUTES.items():
+        endpoint = make_endpoint(schema, source, fast=variant == "model_response")
+        app.add_api_route(path.replace("{user_id}", "42"), endpoint, response_model=schema)
+    return app
+
+
+async def call(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def run(number: int) -> None:
+    variants = ("fastapi default", "orjson default", "model_response")
+    results: dict[str, dict[str, float]] = {}
+    for variant in variants:
+        settings.FAST_JSON = variant == "model_response"
+        app = build_app(variant)
+        for path in ROUTES:
+            concrete = path.replace("{user_id}", "42")
+            for _ in range(200):
+                await call(app, concrete)
+            start = time.perf_counter()
+            for _ in range(number):
+                await call(app, concrete)
+            results.setdefault(path, {})[variant] = (time.perf_counter() - start) / number
+
+    # The pre-0.13x FastAPI path for reference: dump to dict, re-validate,
+    # jsonable_encoder, then json.dumps
+    def legacy(schema, obj):
+        value = schema.model_validate(schema.model_validate(obj, from_attributes=True).model_dump())
+        return JSONResponse(jsonable_encoder(value)).body
+
+    for path, (schema, source) in ROUTES.items():
+        start = time.perf_counter()
+        for _ in range(number):
+            legacy(schema, source())
+        results[path]["legacy encode only"] = (time.perf_counter() - start) / number
+
+    print(f"orjson installed: {responses.orjson is not None}")
+    header = "".join(f"{name:>20}" for name in (*variants, "legacy encode only"))
+    print(f"{'route':<18}{header}   (us/request)")
+    for path, timings in results.items():
+        print(f"{path:<18}" + "".join(f"{timings[name] * 1e6:20.1f}" for name in (*variants, "legacy encode only")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+    os.environ.setdefault("METRICS_ENABLED", "false")
+    asyncio.run(run(args.number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start cost of one worker: `import main` time, and time from spawning
+uvicorn until GET / answers 200 (no database needed for either).
+
+Each run uses a fresh interpreter. Pass --output to save the numbers, e.g.
+to compare before/after a change:
+
+    python -m benchmarks.bench_startup [--runs 5] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from benchmarks.common import BENCH_ENV
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def bench_env() -> dict:
+    return {**BENCH_ENV, "LOG_LEVEL": "WARNING", **os.environ}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def import_time() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], env=bench_env(), capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def time_to_first_200(timeout: float = 30.0) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=bench_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"No 200 from uvicorn within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    samples = {
+        "import_main_s": [import_time() for _ in range(args.runs)],
+        "time_to_first_200_s": [time_to_first_200() for _ in range(args.runs)],
+    }
+    results = {
+        name: {"median": round(statistics.median(values), 4), "min": round(min(values), 4), "max": round(max(values), 4)}
+        for name, values in samples.items()
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"runs": args.runs, **results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
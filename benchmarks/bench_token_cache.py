@@ -0,0 +1,44 @@
+# benchmarks/bench_token_cache.py
+"""
+Decode-per-request vs. verified-token cache for verify_token.
+
+    python -m benchmarks.bench_token_cache [--number 20000]
+"""
+import argparse
+from benchmarks.common import bootstrap_env, time_per_call
+
+bootstrap_env()
+
+from app.core.config import settings  # noqa: E402
+from app.utils import security  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = security.create_tokens({"sub": "bench@example.com", "role": "user"})["access_token"]
+    results = {}
+
+    for name, backend_cls in security.JWT_BACKENDS.items():
+        try:
+            backend = backend_cls()
+        except ImportError:
+            print(f"{name:>6}: not installed, skipped")
+            continue
+
+        def decode():
+            backend.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+
+        results[f"decode ({name})"] = time_per_call(decode, args.number)
+
+    security.verify_token(token)  # warm the cache
+    results["verify_token (cached)"] = time_per_call(lambda: security.verify_token(token), args.number)
+
+    for name, seconds in results.items():
+        print(f"{name:>24}: {seconds * 1e6:9.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/common.py
+"""Shared helpers for the scripts in benchmarks/ (run from the repo root)."""
+import os
+import statistics
+import time
+
+# Enough settings for app.core.config to load without a .env file
+BENCH_ENV = {
+    "ENVIRONMENT": "benchmark",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "postgres",
+    "DB_NAME": "benchmark",
+    "JWT_SECRET_KEY": "benchmark-secret-benchmark-secret-0123",
+    "JWT_ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "15",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "CLOUDINARY_CLOUD_NAME": "benchmark",
+    "CLOUDINARY_API_KEY": "1",
+    "CLOUDINARY_API_SECRET": "benchmark",
+}
+
+
+def bootstrap_env(**overrides) -> None:
+    """Fill in missing settings so the app modules can be imported"""
+    for key, value in {**BENCH_ENV, **overrides}.items():
+        os.environ.setdefault(key, str(value))
+
+
+def time_per_call(func, number: int = 10000, repeat: int = 5) -> float:
+    """Best-of-`repeat` seconds per call of func()"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(samples: list[float]) -> dict:
+    """Latency summary in milliseconds"""
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 4),
+        "p95_ms": round(percentile(samples, 95) * 1000, 4),
+        "p99_ms": round(percentile(samples, 99) * 1000, 4),
+    }
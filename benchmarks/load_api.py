@@ -0,0 +1,245 @@
+# benchmarks/load_api.py
+"""
+Load test of the auth, profile and avatar flows against the real app.
+
+Boots `main.app` in-process (lifespan included) and drives it over httpx's
+ASGI transport, so no server or network is involved. The database is the
+one from the DB_* settings (migrated with `alembic upgrade head`), or a
+throwaway SQLite file with --sqlite (needs aiosqlite unless DB_ASYNC=false;
+SQLite's file lock makes concurrent writes unrepresentative, so compare
+write-heavy scenarios on PostgreSQL).
+Cloudinary is replaced by an in-memory fake with configurable latency; the
+real upload/delete code paths still run.
+
+Every scenario runs --requests requests with --concurrency in flight and
+reports throughput and p50/p95/p99 latency. Results are written as JSON; with
+--baseline they are compared against a stored run and the exit status is 1
+when any scenario regressed by more than --tolerance.
+
+    python -m benchmarks.load_api --sqlite /tmp/load.db --requests 500 --concurrency 20
+    python -m benchmarks.load_api --sqlite /tmp/load.db --save-baseline baseline.json
+    python -m benchmarks.load_api --sqlite /tmp/load.db --baseline baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import struct
+import sys
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+from benchmarks.common import bootstrap_env, summarize
+
+# The rate limiter would throttle the load generator itself
+bootstrap_env(RATE_LIMIT_ENABLED="false", LOG_LEVEL="WARNING", IMAGE_STORAGE_BACKEND="cloudinary")
+
+import httpx  # noqa: E402
+
+SCENARIOS = ("login", "refresh", "me", "user", "avatar")
+# Higher is better for throughput, lower for the latency percentiles
+COMPARED = {"throughput_rps": 1, "p50_ms": -1, "p95_ms": -1, "p99_ms": -1}
+PASSWORD = "load-test-password"
+
+
+class FakeCloudinary:
+    """Stands in for cloudinary.uploader: sleeps like a network call, stores nothing"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def upload(self, file, folder=None, public_id=None, **options):
+        time.sleep(self.latency)
+        public_id = f"{folder}/{public_id or uuid.uuid4().hex}"
+        return {
+            "public_id": public_id,
+            "secure_url": f"https://res.cloudinary.com/load-test/image/upload/v1/{public_id}.webp",
+        }
+
+    def destroy(self, public_id):
+        time.sleep(self.latency)
+        return {"result": "ok"}
+
+
+def tiny_png() -> bytes:
+    """A valid 1x1 PNG, so uploads need no image library"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(b"\x00\x00\x00\x00")) + chunk(b"IEND", b"")
+
+
+def setup_database(sqlite_path: str | None) -> str:
+    from app.db.session import Base, configure_engines
+    import app.models.order, app.models.product, app.models.token, app.models.user  # noqa: F401 (register tables)
+
+    if not sqlite_path:
+        return "postgresql"
+    if os.path.exists(sqlite_path):
+        os.remove(sqlite_path)
+    engines = configure_engines(f"sqlite:///{sqlite_path}", f"sqlite+aiosqlite:///{sqlite_path}")
+    Base.metadata.create_all(engines.engine)
+    return "sqlite"
+
+
+async def seed_users(client: httpx.AsyncClient, count: int) -> list[dict]:
+    run = uuid.uuid4().hex[:8]
+    users = []
+    for i in range(count):
+        email = f"load-{run}-{i}@example.com"
+        response = await client.post(
+            "/api/v1/users/", json={"email": email, "password": PASSWORD, "username": f"load-{run}-{i}"}
+        )
+        response.raise_for_status()
+        users.append({"id": response.json()["id"], "email": email})
+    return users
+
+
+async def log_in(client: httpx.AsyncClient, user: dict) -> dict:
+    response = await client.post("/api/v1/auth/login", json={"email": user["email"], "password": PASSWORD})
+    response.raise_for_status()
+    return {**user, **response.json()}
+
+
+def request_for(scenario: str, user: dict, png: bytes) -> tuple[str, str, dict]:
+    bearer = {"Authorization": f"Bearer {user['access_token']}"}
+    if scenario == "login":
+        return "POST", "/api/v1/auth/login", {"json": {"email": user["email"], "password": PASSWORD}}
+    if scenario == "refresh":
+        return "POST", "/api/v1/auth/refresh", {"headers": {"Authorization": f"Bearer {user['refresh_token']}"}}
+    if scenario == "me":
+        return "GET", "/api/v1/users/me", {"headers": bearer}
+    if scenario == "user":
+        return "GET", f"/api/v1/users/{user['id']}", {}
+    return "PATCH", "/api/v1/users/me/avatar", {"headers": bearer, "files": {"file": ("avatar.png", png, "image/png")}}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: str, users: list[dict], requests: int, concurrency: int, warmup: int
+) -> dict:
+    png = tiny_png()
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    counter = iter(range(requests + warmup))
+
+    # Each worker acts as one account, so writes never race on the same row,
+    # with a login session of its own, since refresh tokens are single-use
+    async def worker(session: dict):
+        for i in counter:
+            method, url, kwargs = request_for(scenario, session, png)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            elapsed = time.perf_counter() - start
+            if scenario == "refresh" and response.status_code == 200:
+                session.update(response.json())
+            if i < warmup:
+                continue
+            latencies.append(elapsed)
+            if response.status_code >= 400:
+                errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+
+    sessions = await asyncio.gather(*(log_in(client, users[n % len(users)]) for n in range(concurrency)))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(session) for session in sessions))
+    wall = time.perf_counter() - start
+    measured_share = requests / (requests + warmup)
+    return {
+        **summarize(latencies),
+        "throughput_rps": round(len(latencies) / (wall * measured_share), 2),
+        "errors": errors,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Human-readable regressions of `results` against `baseline`"""
+    regressions = []
+    for scenario, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario)
+        if not previous:
+            continue
+        for metric, direction in COMPARED.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change * direction < -tolerance:
+                regressions.append(f"{scenario}.{metric}: {old} -> {new} ({change:+.1%})")
+        if sum(current["errors"].values()) > sum(previous.get("errors", {}).values()):
+            regressions.append(f"{scenario}.errors: {previous.get('errors', {})} -> {current['errors']}")
+    return regressions
+
+
+async def main_async(args) -> dict:
+    database = setup_database(args.sqlite)
+    args.users = args.users or args.concurrency
+
+    from app.utils import cloudinary_utils
+    cloudinary_utils.get_uploader = lambda: FakeCloudinary(args.cloudinary_latency_ms / 1000)
+
+    import main
+    from app.core.config import settings
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=60) as client:
+            users = await seed_users(client, args.users)
+            scenarios = {}
+            for scenario in args.scenarios:
+                scenarios[scenario] = await run_scenario(
+                    client, scenario, users, args.requests, args.concurrency, args.warmup
+                )
+                print(
+                    f"{scenario:>8}: {scenarios[scenario]['throughput_rps']:8.1f} req/s  "
+                    f"p50 {scenarios[scenario]['p50_ms']:8.2f} ms  p95 {scenarios[scenario]['p95_ms']:8.2f} ms  "
+                    f"p99 {scenarios[scenario]['p99_ms']:8.2f} ms  errors {scenarios[scenario]['errors'] or 0}"
+                )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": database,
+            "db_async": settings.DB_ASYNC,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "cloudinary_latency_ms": args.cloudinary_latency_ms,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--users", type=int, help="Accounts shared by the workers (default: one per worker)")
+    parser.add_argument("--sqlite", metavar="PATH", help="Use a fresh SQLite file instead of the DB_* database")
+    parser.add_argument("--cloudinary-latency-ms", type=float, default=50.0)
+    parser.add_argument("--output", default="load_api_results.json")
+    parser.add_argument("--baseline", help="Compare against this results file; exit 1 on regression")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Also write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative change, e.g. 0.10 = 10%%")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
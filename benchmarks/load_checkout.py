@@ -0,0 +1,114 @@
+# benchmarks/load_checkout.py
+"""
+Concurrent checkouts of one hot SKU: proves no overselling and measures
+orders/sec.
+
+Creates --buyers users, a product with --stock units and one cart line per
+buyer in the database from the DB_* settings (migrated with
+`alembic upgrade head`), then fires every checkout at once through
+order_service.checkout with --concurrency sessions in flight. Exits non-zero
+if more units were sold than stocked or stock went negative.
+
+    python -m benchmarks.load_checkout --buyers 500 --stock 200 --concurrency 200
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from benchmarks.common import bootstrap_env, summarize
+
+bootstrap_env(DB_POOL_SIZE="50", DB_MAX_OVERFLOW="200")
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+from app.db.session import AsyncSessionLocal, SessionLocal, dispose_engines  # noqa: E402
+from app.models.order import CartItem, Inventory, Order, OrderItem  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.services.order_service import checkout  # noqa: E402
+
+
+def setup(buyers: int, stock: int) -> tuple[int, list[int]]:
+    run = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        seller = User(email=f"seller-{run}@bench.local", username=f"seller-{run}", password="x", role=UserRole.SELLER)
+        db.add(seller)
+        db.flush()
+        product = Product(seller_id=seller.id, sku=f"HOT-{run}", name="Hot SKU", price=10)
+        db.add(product)
+        db.flush()
+        db.add(Inventory(product_id=product.id, available=stock))
+        users = [
+            User(email=f"buyer-{run}-{i}@bench.local", username=f"buyer-{run}-{i}", password="x")
+            for i in range(buyers)
+        ]
+        db.add_all(users)
+        db.flush()
+        db.add_all(CartItem(user_id=u.id, product_id=product.id, quantity=1) for u in users)
+        db.commit()
+        return product.id, [u.id for u in users]
+
+
+async def buy(user_id: int, semaphore: asyncio.Semaphore, latencies: list, outcome: dict) -> None:
+    async with semaphore:
+        start = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            user = await db.get(User, user_id)
+            try:
+                await checkout(db, user)
+                outcome["sold"] += 1
+            except HTTPException as e:
+                outcome["rejected" if e.status_code == 409 else "errors"] += 1
+        latencies.append(time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--buyers", type=int, default=500)
+    parser.add_argument("--stock", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    if AsyncSessionLocal is None:
+        raise SystemExit("Set DB_ASYNC=true for this load test")
+    product_id, user_ids = setup(args.buyers, args.stock)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    outcome = {"sold": 0, "rejected": 0, "errors": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(buy(uid, semaphore, latencies, outcome) for uid in user_ids))
+    elapsed = time.perf_counter() - start
+
+    async with AsyncSessionLocal() as db:
+        remaining = await db.scalar(select(Inventory.available).where(Inventory.product_id == product_id))
+        units_ordered = await db.scalar(
+            select(func.coalesce(func.sum(OrderItem.quantity), 0)).where(OrderItem.product_id == product_id)
+        )
+        orders = await db.scalar(
+            select(func.count(Order.id.distinct()))
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .where(OrderItem.product_id == product_id)
+        )
+    await dispose_engines()
+
+    report = {
+        **outcome,
+        "orders": orders,
+        "units_ordered": units_ordered,
+        "stock_remaining": remaining,
+        "orders_per_second": round(outcome["sold"] / elapsed, 1),
+        "latency": summarize(latencies),
+    }
+    print(json.dumps(report, indent=2))
+
+    expected_sold = min(args.buyers, args.stock)
+    if units_ordered != args.stock - remaining or remaining < 0 or units_ordered > args.stock:
+        raise SystemExit("OVERSOLD: inventory and orders disagree")
+    if outcome["sold"] != expected_sold:
+        raise SystemExit(f"Expected {expected_sold} successful checkouts, got {outcome['sold']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,35 +1,63 @@
+import asyncio
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.logger import setup_logging
+from app.core.metrics import registry
+from app.core.middleware import BodySizeLimitMiddleware, MetricsMiddleware, RequestIdMiddleware
+from app.core.responses import FastJSONResponse
 from app.api.v1.endpoints import users
 from app.api.v1.endpoints import auth
-from app.db.session import create_all_tables, engine
+from app.api.v1.endpoints import admin
+from app.api.v1.endpoints import products
+from app.api.v1.endpoints import categories
+from app.api.v1.endpoints import cart
+from app.api.v1.endpoints import orders
+from app.db.session import create_all_tables, dispose_engines
+from app.services.password_service import password_hasher
+from app.services.image_service import image_pool
+from app.services.token_revocation import token_revocations
 import logging
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup code
-    try:
-        logger.info("Initializing database tables...")
-        create_all_tables()
-        logger.info("Database tables initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {str(e)}")
-        raise
+    # Startup code. The schema is owned by Alembic (`alembic upgrade head`);
+    # create_all is a development convenience only, and engines/clients are
+    # created on first use, so a worker boots without touching the database.
+    if settings.DB_CREATE_TABLES_ON_STARTUP:
+        try:
+            logger.info("Initializing database tables...")
+            create_all_tables()
+            logger.info("Database tables initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize database: {str(e)}")
+            raise
+
+    # Keeps the token denylist current across instances; idle until first use
+    revocation_task = (
+        asyncio.create_task(token_revocations.run_maintenance())
+        if settings.TOKEN_REVOCATION_ENABLED
+        else None
+    )
     
     yield  # App runs here
     
     # Shutdown code
     logger.info("Shutting down application...")
     try:
-        # Properly dispose the engine if using async
-        if engine.is_async:
-            await engine.dispose()
+        if revocation_task is not None:
+            revocation_task.cancel()
+        # Dispose both the sync and (if enabled) async engine pools
+        await dispose_engines()
+        password_hasher.shutdown()
+        image_pool.shutdown()
         logger.info("Cleanup completed")
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}")
@@ -39,10 +67,20 @@ app = FastAPI(
     # description=settings.PROJECT_DESCRIPTION,
     # version=settings.VERSION,
     lifespan=lifespan,
+    # Hot routes use model_response(); this covers plain dict responses
+    **({"default_response_class": FastJSONResponse} if settings.FAST_JSON else {}),
     # docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
     # redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None
 )
 
+# Refuse oversized avatars before the multipart parser spools them; the
+# slack covers the multipart framing around the file. Inside CORS, so the
+# 413 still carries the CORS headers
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={f"{settings.API_V1_STR}/users/me/avatar": settings.AVATAR_MAX_BYTES + 64 * 1024},
+)
+
 # Safer CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -52,6 +90,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Inside the metrics middleware, so request latency includes compression
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=tuple(e.strip() for e in settings.COMPRESSION_ENCODINGS.split(",") if e.strip()),
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        content_types=tuple(t.strip() for t in settings.COMPRESSION_CONTENT_TYPES.split(",") if t.strip()),
+        levels={
+            "gzip_level": settings.COMPRESSION_GZIP_LEVEL,
+            "brotli_quality": settings.COMPRESSION_BROTLI_QUALITY,
+            "zstd_level": settings.COMPRESSION_ZSTD_LEVEL,
+        },
+    )
+
+# Outermost, so latency includes every other middleware
+if settings.METRICS_ENABLED or settings.QUERY_PROFILING or settings.SERVER_TIMING:
+    app.add_middleware(
+        MetricsMiddleware,
+        record_metrics=settings.METRICS_ENABLED,
+        profile_queries=settings.QUERY_PROFILING,
+        repeat_threshold=settings.QUERY_REPEAT_THRESHOLD,
+        server_timing=settings.SERVER_TIMING,
+    )
+
+# Outside the metrics middleware so slow-query and N+1 logs carry the id too
+app.add_middleware(RequestIdMiddleware, header=settings.REQUEST_ID_HEADER)
+
 # Include routers
 # app.include_router(
 #     users.router,
@@ -62,7 +127,18 @@ app.add_middleware(
 
 app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["Authentication"])
+app.include_router(products.router, prefix=f"{settings.API_V1_STR}/products", tags=["Products"])
+app.include_router(categories.router, prefix=f"{settings.API_V1_STR}/categories", tags=["Categories"])
+app.include_router(cart.router, prefix=f"{settings.API_V1_STR}/cart", tags=["Cart"])
+app.include_router(orders.router, prefix=f"{settings.API_V1_STR}/orders", tags=["Orders"])
+app.include_router(admin.router, prefix=f"{settings.API_V1_STR}/admin", tags=["Admin"])
 
 @app.get("/", include_in_schema=False)
 def health_check():
     return {"status": "healthy", "version": settings.VERSION}
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
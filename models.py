@@ -1,11 +0,0 @@
-
-from sqlalchemy import TIMESTAMP, Column, String, Boolean, Integer, text
-from app.db.session import Base
-
-class User(Base):
-    __tablename__ = "users"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True)
-    password = Column(String, nullable = False)
-    created_at = Column(TIMESTAMP(timezone = True), nullable = False, server_default=text("now"))
\ No newline at end of file
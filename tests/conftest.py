@@ -0,0 +1,108 @@
+# tests/conftest.py
+"""
+The app against a throwaway SQLite database, driven over httpx's ASGI
+transport (needs aiosqlite). Run from the repo root: python -m pytest
+"""
+import os
+import tempfile
+import uuid
+
+_tmp = tempfile.mkdtemp(prefix="ecommerce-tests-")
+
+# Enough settings for app.core.config to load without a .env file
+for key, value in {
+    "ENVIRONMENT": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "postgres",
+    "DB_NAME": "test",
+    "DB_ASYNC": "true",
+    "JWT_SECRET_KEY": "test-secret-test-secret-test-secret-0123",
+    "JWT_ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "15",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "CLOUDINARY_CLOUD_NAME": "test",
+    "CLOUDINARY_API_KEY": "1",
+    "CLOUDINARY_API_SECRET": "test",
+    "IMAGE_STORAGE_BACKEND": "local",
+    "LOCAL_STORAGE_DIR": os.path.join(_tmp, "media"),
+    "RATE_LIMIT_ENABLED": "false",
+    "CATALOG_CACHE_BACKEND": "none",
+    "BCRYPT_ROUNDS": "4",
+    "LOG_LEVEL": "WARNING",
+}.items():
+    os.environ.setdefault(key, value)
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+import pytest_asyncio  # noqa: E402
+from sqlalchemy import event, update  # noqa: E402
+from app.db.session import Base, configure_engines, dispose_engines  # noqa: E402
+import app.models.order, app.models.product, app.models.token  # noqa: E402,F401 (register tables)
+from app.models.user import User, UserRole  # noqa: E402
+from app.services.token_revocation import token_revocations  # noqa: E402
+
+engines = configure_engines(
+    f"sqlite:///{_tmp}/test.db", f"sqlite+aiosqlite:///{_tmp}/test.db"
+)
+
+
+def _enforce_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores ON DELETE rules unless asked to; PostgreSQL always applies them
+    dbapi_connection.execute("PRAGMA foreign_keys = ON")
+
+
+for _engine in (engines.engine, engines.async_engine.sync_engine):
+    event.listen(_engine, "connect", _enforce_foreign_keys)
+
+import main  # noqa: E402
+
+PASSWORD = "test-password"
+
+
+@pytest_asyncio.fixture
+async def database():
+    """Empty tables; pooled connections are closed afterwards"""
+    Base.metadata.drop_all(engines.engine)
+    Base.metadata.create_all(engines.engine)
+    # Fresh denylist for the fresh table (and this test's event loop)
+    token_revocations.__init__(token_revocations.capacity, token_revocations.error_rate)
+    yield engines
+    await dispose_engines()
+
+
+@pytest_asyncio.fixture
+async def client(database):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+
+
+@pytest.fixture
+def make_user(client):
+    """Register an account (unique email) and log it in"""
+    async def make(role: str | None = None) -> dict:
+        email = f"user-{uuid.uuid4().hex[:12]}@example.com"
+        response = await client.post(
+            "/api/v1/users/", json={"email": email, "password": PASSWORD, "username": email.split("@")[0]}
+        )
+        assert response.status_code == 200, response.text
+        user = response.json()
+        if role is not None:
+            async with engines.AsyncSessionLocal() as db:
+                await db.execute(update(User).where(User.id == user["id"]).values(role=UserRole(role)))
+                await db.commit()
+        return {**user, **await log_in(client, email)}
+
+    return make
+
+
+async def log_in(client: httpx.AsyncClient, email: str) -> dict:
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"email": email, **response.json()}
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,82 @@
+# tests/test_avatar.py
+import os
+import pytest
+from sqlalchemy import update
+from conftest import bearer
+from app.api.v1.endpoints import users
+from app.core.config import settings
+from app.models.user import User
+from app.services import avatar_service
+
+AVATAR = "/api/v1/users/me/avatar"
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 1024
+
+
+def stored_path(url: str) -> str:
+    return os.path.join(settings.LOCAL_STORAGE_DIR, url[len(settings.LOCAL_STORAGE_BASE_URL) + 1:])
+
+
+@pytest.mark.asyncio
+async def test_avatar_is_stored_and_replaced(client, make_user):
+    user = await make_user()
+    first = await client.patch(
+        AVATAR, files={"file": ("a.png", PNG, "image/png")}, headers=bearer(user["access_token"])
+    )
+    assert first.status_code == 200, first.text
+    with open(stored_path(first.json()["avatar_url"]), "rb") as stored:
+        assert stored.read() == PNG
+
+    second = await client.patch(
+        AVATAR, files={"file": ("b.png", PNG, "image/png")}, headers=bearer(user["access_token"])
+    )
+    assert second.status_code == 200
+    # The old image is deleted after the response
+    assert not os.path.exists(stored_path(first.json()["avatar_url"]))
+
+
+@pytest.mark.asyncio
+async def test_oversized_avatar_is_refused_by_its_content_length(client, make_user):
+    user = await make_user()
+    body = b"\x00" * (settings.AVATAR_MAX_BYTES + 128 * 1024)
+    response = await client.patch(
+        AVATAR, files={"file": ("big.png", body, "image/png")}, headers=bearer(user["access_token"])
+    )
+    assert response.status_code == 413
+    assert "Request body" in response.json()["detail"]
+
+
+def test_failed_image_delete_is_retried_and_logged(monkeypatch, caplog):
+    attempts = []
+
+    def delete(url):
+        attempts.append(url)
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(avatar_service.image_storage, "delete", delete)
+    assert avatar_service.delete_image_with_retry("http://img/a.png", retries=2, backoff=0) is False
+    assert attempts == ["http://img/a.png"] * 2
+    assert "Giving up deleting image" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_concurrent_profile_change_during_upload_is_409_and_new_image_is_removed(
+    client, database, make_user, monkeypatch
+):
+    user = await make_user()
+    uploaded = []
+
+    async def upload_avatar(file, folder):
+        url = await avatar_service.upload_avatar(file, folder)
+        uploaded.append(url)
+        # Another request updates the profile while this upload is in flight
+        async with database.AsyncSessionLocal() as db:
+            await db.execute(update(User).where(User.id == user["id"]).values(version=User.version + 1))
+            await db.commit()
+        return url
+
+    monkeypatch.setattr(users, "upload_avatar", upload_avatar)
+    response = await client.patch(
+        AVATAR, files={"file": ("a.png", PNG, "image/png")}, headers=bearer(user["access_token"])
+    )
+    assert response.status_code == 409
+    assert len(uploaded) == 1 and not os.path.exists(stored_path(uploaded[0]))
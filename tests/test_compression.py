@@ -0,0 +1,123 @@
+# tests/test_compression.py
+import json
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI, Response
+from fastapi.responses import StreamingResponse
+from app.core.compression import CompressionMiddleware, choose_encoding, compression
+
+ROWS = [{"id": n, "email": f"user{n}@example.com", "role": "user"} for n in range(200)]
+BODY = json.dumps(ROWS).encode()
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, encodings=("gzip",), minimum_size=1024)
+
+    @app.get("/large")
+    def large():
+        return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" + b"\x00" * 4096, media_type="image/png")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(BODY, media_type="application/json", headers={"Content-Encoding": "identity"})
+
+    @app.get("/not-modified")
+    def not_modified():
+        return Response(status_code=304, headers={"ETag": '"v1"'})
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (json.dumps(row).encode() + b"\n" for row in ROWS), media_type="application/x-ndjson"
+        )
+
+    @app.get("/uncompressed", dependencies=[Depends(compression(enabled=False))])
+    def uncompressed():
+        return Response(BODY, media_type="application/json")
+
+    @app.get("/stored", dependencies=[Depends(compression(gzip_level=0))])
+    def stored():
+        return Response(BODY, media_type="application/json")
+
+    return app
+
+
+@pytest_asyncio.fixture
+async def client():
+    """Shadows the conftest client: the middleware alone, no database"""
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+
+
+async def get(client, path: str, accept: str = "gzip", **headers) -> httpx.Response:
+    return await client.get(path, headers={"Accept-Encoding": accept, **headers})
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped(client):
+    response = await get(client, "/large")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
+    assert int(response.headers["content-length"]) == response.num_bytes_downloaded < len(BODY)
+    assert "Accept-Encoding" in response.headers["vary"]
+    # The compressed bytes differ from the identity ones the strong ETag described
+    assert response.headers["etag"] == 'W/"v1"'
+
+
+@pytest.mark.asyncio
+async def test_uncompressed_unless_the_client_accepts_it(client):
+    for accept in ("identity", "br", "gzip;q=0", "*;q=0.5, gzip;q=0"):
+        response = await get(client, "/large", accept=accept)
+        assert "content-encoding" not in response.headers, accept
+        assert response.content == BODY
+        assert "Accept-Encoding" in response.headers["vary"]
+    assert (await get(client, "/large", accept="*")).headers["content-encoding"] == "gzip"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/small", "/image", "/not-modified", "/uncompressed"])
+async def test_left_alone(client, path):
+    response = await get(client, path)
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_existing_content_encoding_is_kept(client):
+    response = await get(client, "/encoded")
+    assert response.headers["content-encoding"] == "identity"
+    assert response.content == BODY
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_is_compressed_as_it_goes(client):
+    response = await get(client, "/stream")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert [json.loads(line) for line in response.text.splitlines()] == ROWS
+
+
+@pytest.mark.asyncio
+async def test_per_route_level(client):
+    # Level 0 only wraps the body in gzip framing, so it comes out larger
+    response = await get(client, "/stored")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
+    assert response.num_bytes_downloaded > len(BODY)
+
+
+def test_choose_encoding_prefers_q_then_server_order():
+    assert choose_encoding("gzip, br", ["br", "gzip"]) == "br"
+    assert choose_encoding("gzip;q=1, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert choose_encoding("deflate", ["br", "gzip"]) is None
+    assert choose_encoding("", ["gzip"]) is None
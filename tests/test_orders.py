@@ -0,0 +1,119 @@
+# tests/test_orders.py
+import asyncio
+import pytest
+from sqlalchemy import select
+from conftest import bearer
+from app.models.order import Inventory
+
+pytestmark = pytest.mark.asyncio
+
+
+async def create_product(client, seller: dict, stock: int) -> int:
+    response = await client.post(
+        "/api/v1/products/", json={"name": "Shoe", "sku": f"sku-{seller['id']}", "price": "9.99"},
+        headers=bearer(seller["access_token"]),
+    )
+    assert response.status_code == 201, response.text
+    product_id = response.json()["id"]
+    response = await client.put(
+        f"/api/v1/products/{product_id}/stock", json={"available": stock}, headers=bearer(seller["access_token"])
+    )
+    assert response.status_code == 200, response.text
+    return product_id
+
+
+async def add_to_cart(client, user: dict, product_id: int, quantity: int) -> None:
+    response = await client.put(
+        f"/api/v1/cart/items/{product_id}", json={"quantity": quantity}, headers=bearer(user["access_token"])
+    )
+    assert response.status_code == 200, response.text
+
+
+async def available(database, product_id: int) -> int:
+    async with database.AsyncSessionLocal() as db:
+        return await db.scalar(select(Inventory.available).where(Inventory.product_id == product_id))
+
+
+async def test_checkout_reserves_stock_and_rejects_what_is_left_short(client, database, make_user):
+    seller = await make_user("seller")
+    product_id = await create_product(client, seller, stock=3)
+    first, second = await make_user(), await make_user()
+    await add_to_cart(client, first, product_id, 2)
+    await add_to_cart(client, second, product_id, 2)
+
+    response = await client.post("/api/v1/orders/checkout", headers=bearer(first["access_token"]))
+    assert response.status_code == 201
+    assert response.json()["total"] == "19.98"
+    assert await available(database, product_id) == 1
+
+    response = await client.post("/api/v1/orders/checkout", headers=bearer(second["access_token"]))
+    assert response.status_code == 409
+    # Nothing of the failed checkout sticks: stock, order and the cart stay as they were
+    assert await available(database, product_id) == 1
+    assert (await client.get("/api/v1/orders/", headers=bearer(second["access_token"]))).json() == []
+    cart = (await client.get("/api/v1/cart/", headers=bearer(second["access_token"]))).json()
+    assert [item["quantity"] for item in cart["items"]] == [2]
+
+
+async def test_cancel_restocks_once(client, database, make_user):
+    seller = await make_user("seller")
+    product_id = await create_product(client, seller, stock=3)
+    buyer = await make_user()
+    await add_to_cart(client, buyer, product_id, 2)
+    order = (await client.post("/api/v1/orders/checkout", headers=bearer(buyer["access_token"]))).json()
+
+    cancel = f"/api/v1/orders/{order['id']}/cancel"
+    response = await client.post(cancel, headers=bearer(buyer["access_token"]))
+    assert response.status_code == 200
+    assert response.json()["status"] == "cancelled"
+    assert (await client.post(cancel, headers=bearer(buyer["access_token"]))).status_code == 409
+    assert await available(database, product_id) == 3
+
+
+async def test_concurrent_checkouts_never_oversell(client, database, make_user):
+    seller = await make_user("seller")
+    product_id = await create_product(client, seller, stock=3)
+    buyers = [await make_user() for _ in range(6)]
+    for buyer in buyers:
+        await add_to_cart(client, buyer, product_id, 1)
+
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/orders/checkout", headers=bearer(buyer["access_token"])) for buyer in buyers
+    ))
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [201] * 3 + [409] * 3
+    assert await available(database, product_id) == 0
+
+
+async def test_concurrent_checkouts_of_one_cart_place_one_order(client, database, make_user):
+    seller = await make_user("seller")
+    product_id = await create_product(client, seller, stock=10)
+    buyer = await make_user()
+    await add_to_cart(client, buyer, product_id, 2)
+
+    # A double click: the cart can only be turned into an order once
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/orders/checkout", headers=bearer(buyer["access_token"])) for _ in range(3)
+    ))
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses[0] == 201 and all(code in (400, 409) for code in statuses[1:]), statuses
+    assert len((await client.get("/api/v1/orders/", headers=bearer(buyer["access_token"]))).json()) == 1
+    assert await available(database, product_id) == 8
+
+
+async def test_seller_with_ordered_products_can_delete_their_account(client, database, make_user):
+    seller = await make_user("seller")
+    product_id = await create_product(client, seller, stock=3)
+    buyer = await make_user()
+    await add_to_cart(client, buyer, product_id, 1)
+    order = (await client.post("/api/v1/orders/checkout", headers=bearer(buyer["access_token"]))).json()
+    other = await make_user()
+    await add_to_cart(client, other, product_id, 1)
+
+    assert (await client.delete("/api/v1/users/me", headers=bearer(seller["access_token"]))).status_code == 204
+    # The buyer's order keeps its product; the product is no longer for sale or in any cart
+    response = await client.get(f"/api/v1/orders/{order['id']}", headers=bearer(buyer["access_token"]))
+    assert [item["product_id"] for item in response.json()["items"]] == [product_id]
+    product = (await client.get(f"/api/v1/products/{product_id}")).json()
+    assert (product["is_active"], product["seller_id"]) == (False, None)
+    assert (await client.get("/api/v1/cart/", headers=bearer(other["access_token"]))).json()["items"] == []
@@ -0,0 +1,24 @@
+# tests/test_rate_limit.py
+import pytest
+from pydantic import ValidationError
+from app.core.config import Settings
+from app.core.rate_limit import MemoryRateLimitStore, rate_limit_by_ip
+
+
+def test_bucket_refills_at_the_configured_rate():
+    store = MemoryRateLimitStore()
+    assert store.take("k", capacity=2, refill_per_second=1.0) == 0.0
+    assert store.take("k", capacity=2, refill_per_second=1.0) == 0.0
+    assert 0 < store.take("k", capacity=2, refill_per_second=1.0) <= 1.0
+
+
+@pytest.mark.parametrize("limits", [{"per_minute": 0}, {"capacity": 0}, {"per_minute": -1}])
+def test_non_positive_limits_are_rejected_up_front(limits):
+    with pytest.raises(ValueError):
+        rate_limit_by_ip(**limits)
+
+
+def test_settings_reject_a_zero_rate(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_IP_PER_MINUTE", "0")
+    with pytest.raises(ValidationError):
+        Settings()
@@ -0,0 +1,154 @@
+# tests/test_token_revocation.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from conftest import PASSWORD, bearer, log_in
+from app.models.token import RevokedToken
+from app.services.token_revocation import NOT_REVOKED, token_revocations
+from app.utils.security import create_tokens, verify_token
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_refresh_rotates_and_old_token_is_single_use(client, make_user):
+    user = await make_user()
+    response = await client.post("/api/v1/auth/refresh", headers=bearer(user["refresh_token"]))
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != user["refresh_token"]
+    # Same login session
+    assert verify_token(rotated["refresh_token"])["fam"] == verify_token(user["refresh_token"])["fam"]
+    assert (await client.get("/api/v1/users/me", headers=bearer(rotated["access_token"]))).status_code == 200
+
+
+async def test_refresh_token_reuse_revokes_the_whole_family(client, make_user):
+    user = await make_user()
+    rotated = (await client.post("/api/v1/auth/refresh", headers=bearer(user["refresh_token"]))).json()
+
+    # Replaying the exchanged token means it leaked
+    replay = await client.post("/api/v1/auth/refresh", headers=bearer(user["refresh_token"]))
+    assert replay.status_code == 401
+
+    # ...so every token of that login session is dead, the legitimate ones included
+    assert (await client.post("/api/v1/auth/refresh", headers=bearer(rotated["refresh_token"]))).status_code == 401
+    assert (await client.get("/api/v1/users/me", headers=bearer(rotated["access_token"]))).status_code == 401
+
+    # Other login sessions of the same account are untouched
+    other = await log_in(client, user["email"])
+    assert (await client.get("/api/v1/users/me", headers=bearer(other["access_token"]))).status_code == 200
+
+
+async def test_logout_revokes_only_its_session(client, make_user):
+    user = await make_user()
+    other = await log_in(client, user["email"])
+    assert (await client.post("/api/v1/auth/logout", headers=bearer(user["refresh_token"]))).status_code == 204
+
+    assert (await client.get("/api/v1/users/me", headers=bearer(user["access_token"]))).status_code == 401
+    assert (await client.post("/api/v1/auth/refresh", headers=bearer(user["refresh_token"]))).status_code == 401
+    assert (await client.get("/api/v1/users/me", headers=bearer(other["access_token"]))).status_code == 200
+
+
+async def test_account_deletion_revokes_subject_but_not_a_new_account(client, make_user):
+    user = await make_user()
+    assert (await client.delete("/api/v1/users/me", headers=bearer(user["access_token"]))).status_code == 204
+    assert (await client.get("/api/v1/users/me", headers=bearer(user["access_token"]))).status_code == 401
+    assert (await client.post("/api/v1/auth/refresh", headers=bearer(user["refresh_token"]))).status_code == 401
+
+    # Re-registered within the same second as the revocation
+    response = await client.post(
+        "/api/v1/users/", json={"email": user["email"], "password": PASSWORD, "username": "reborn"}
+    )
+    assert response.status_code == 200
+    fresh = await log_in(client, user["email"])
+    assert (await client.get("/api/v1/users/me", headers=bearer(fresh["access_token"]))).status_code == 200
+
+
+async def test_revocation_compares_iat_below_the_second(database):
+    async with database.AsyncSessionLocal() as db:
+        before = verify_token(create_tokens({"sub": "iat@example.com"})["access_token"])
+        await token_revocations.revoke_subject(db, "iat@example.com")
+    after = verify_token(create_tokens({"sub": "iat@example.com"})["access_token"])
+
+    assert await token_revocations.is_revoked(before)
+    assert not await token_revocations.is_revoked(after)
+
+
+async def test_concurrent_consume_lets_exactly_one_refresh_through(database):
+    payload = verify_token(create_tokens({"sub": "race@example.com"})["refresh_token"])
+
+    async def consume():
+        async with database.AsyncSessionLocal() as db:
+            return await token_revocations.consume(db, payload)
+
+    assert sorted(await asyncio.gather(consume(), consume())) == [False, True]
+    # Sequential replays lose too
+    assert await consume() is False
+    assert await token_revocations.is_revoked(payload)
+
+
+async def test_filter_false_positive_is_confirmed_against_the_table(database):
+    await token_revocations.is_revoked({})  # load the (empty) filter
+    payload = verify_token(create_tokens({"sub": "fp@example.com"})["access_token"])
+    key = f"jti:{payload['jti']}"
+    # In the filter, but never revoked: what a false positive looks like
+    token_revocations._filter.add(key)
+
+    assert not await token_revocations.is_revoked(payload)
+    assert token_revocations._checked.get(key) == NOT_REVOKED
+
+
+async def test_revocation_made_elsewhere_arrives_with_sync(database):
+    await token_revocations.is_revoked({})
+    payload = verify_token(create_tokens({"sub": "sync@example.com"})["access_token"])
+
+    # Another instance revokes the subject: the row exists, this filter hasn't seen it
+    async with database.AsyncSessionLocal() as db:
+        db.add(RevokedToken(
+            key="sub:sync@example.com",
+            revoked_at=datetime.now(timezone.utc),
+            expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+        ))
+        await db.commit()
+    assert not await token_revocations.is_revoked(payload)
+
+    await token_revocations.sync()
+    assert await token_revocations.is_revoked(payload)
+
+
+async def test_concurrent_access_changes_both_apply_and_revoke_old_tokens(client, make_user):
+    admin = await make_user("admin")
+    user = await make_user()
+    access = f"/api/v1/admin/users/{user['id']}/access"
+
+    responses = await asyncio.gather(
+        client.patch(access, json={"role": "seller"}, headers=bearer(admin["access_token"])),
+        client.patch(access, json={"is_active": True}, headers=bearer(admin["access_token"])),
+    )
+    assert [response.status_code for response in responses] == [200, 200]
+    assert sorted(response.json()["token_version"] for response in responses) == [1, 2]
+    assert (await client.get("/api/v1/users/me", headers=bearer(user["access_token"]))).status_code == 401
+
+    fresh = await log_in(client, user["email"])
+    assert verify_token(fresh["access_token"])["tv"] == 2
+    assert (await client.get("/api/v1/users/me", headers=bearer(fresh["access_token"]))).json()["role"] == "seller"
+
+
+async def test_access_change_rejects_explicit_null(client, make_user):
+    admin = await make_user("admin")
+    user = await make_user()
+    access = f"/api/v1/admin/users/{user['id']}/access"
+    response = await client.patch(access, json={"role": None}, headers=bearer(admin["access_token"]))
+    assert response.status_code == 422
+    assert (await client.patch(access, json={}, headers=bearer(admin["access_token"]))).status_code == 200
+
+
+async def test_account_deletion_succeeds_when_revocation_fails(client, make_user, monkeypatch):
+    user = await make_user()
+
+    async def revoke_subject(db, subject):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(token_revocations, "revoke_subject", revoke_subject)
+    assert (await client.delete("/api/v1/users/me", headers=bearer(user["access_token"]))).status_code == 204
+    # Not revoked, but the account no longer exists
+    assert (await client.get("/api/v1/users/me", headers=bearer(user["access_token"]))).status_code == 404